@@ -3,9 +3,11 @@ the ``constraints`` key, it will proceed further. It will read the ``name`` key,
 characters) hash of the YAML file, append it with list of elements forming the elemental spcae, and use it as the 
 name and if the directory with the name does not exist under the ``ammap/callables`` directory, it will create one 
 and also create a ``__init__.py`` file to make it a package. It will then read the ``ammap/templates/LCdensity.py``, 
-prepend it with constants based on the YAML file, and write it to the output directory.
+prepend it with constants based on the YAML file, and write it to the output directory. Elemental densities are
+resolved here, once, with ``pymatgen``, so the generated callable does not need it at runtime.
 """
 from ruamel.yaml import YAML
+from pymatgen.core.periodic_table import Element
 import os
 import hashlib
 from pathlib import Path
@@ -50,6 +52,9 @@ def constructCallable(name: str, hash: str, data: dict):
         raise ValueError('No elements key found in the YAML file')
     else:
         constantsPayload += f"ELEMENTS = {elements}\n"
+        # Densities of the elemental solids in g/cm^3
+        densities = [round(Element(element).density_of_solid * 0.001, 6) for element in elements]
+        constantsPayload += f"DENSITIES = {densities}\n"
     
     headerPayload = f'"""Linear Combination (atomic-fraction based) of elemental densities in {"-".join(elements)} system with constraints: '
     
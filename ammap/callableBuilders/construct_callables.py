@@ -24,6 +24,9 @@ def construct_callables(yaml_file):
     
     with open('ammap/templates/scheil_callable_template.py', 'r') as f:
         scheil_template = f.read()
+
+    with open('ammap/templates/combined_callable_template.py', 'r') as f:
+        combined_template = f.read()
     
     # Read hybrid template if it exists
     hybrid_template = None
@@ -37,6 +40,8 @@ def construct_callables(yaml_file):
     eq_constraint = next((c for c in constraints if c['type'].lower() == 'equilibrium'), None)
     scheil_constraint = next((c for c in constraints if c['type'].lower() == 'scheil'), None)
     hybrid_constraint = next((c for c in constraints if c['type'].lower() == 'hybrid-scheil'), None)
+    cracking_constraint = next(
+        (c for c in constraints if c['type'].lower() in ['am cracking susceptibility', 'cracking']), None)
     
     for callable_config in data['elementalSpaces']:
         name = callable_config['name']
@@ -85,7 +90,11 @@ def construct_callables(yaml_file):
                 elements=elements,
                 scheil_start_temperature=scheil_constraint.get('startTemperature', 2500),
                 liquid_phase_name=scheil_constraint.get('liquidPhase', 'LIQUID'),
-                step_temperature=scheil_constraint.get('step_temperature', 1)
+                step_temperature=scheil_constraint.get('step_temperature', 1),
+                adaptive=scheil_constraint.get('adaptive', False),
+                tolerance=scheil_constraint.get('tolerance', 0.02),
+                max_step_temperature=scheil_constraint.get('max_step_temperature', 20),
+                liquidus_search=scheil_constraint.get('liquidus_search', False)
             )
             
             scheil_output_file = f"{output_dir}/scheil_callable_{name}_{unique_id}.py"
@@ -93,6 +102,21 @@ def construct_callables(yaml_file):
                 f.write(scheil_content)
             
             print(f"Scheil callable constructed: {scheil_output_file}")
+
+        # Construct the combined callable, evaluating equilibrium, Scheil and cracking in one call per composition
+        if scheil_constraint and (eq_constraint or cracking_constraint):
+            package = output_dir.replace('/', '.')
+            combined_content = combined_template.format(
+                equilibrium_module=repr(f"{package}.equilibrium_callable_{name}_{unique_id}") if eq_constraint else None,
+                scheil_module=repr(f"{package}.scheil_callable_{name}_{unique_id}"),
+                criteria=cracking_constraint.get('criteria', []) if cracking_constraint else []
+            )
+
+            combined_output_file = f"{output_dir}/combined_callable_{name}_{unique_id}.py"
+            with open(combined_output_file, 'w') as f:
+                f.write(combined_content)
+
+            print(f"Combined callable constructed: {combined_output_file}")
         
         # Construct hybrid callable if constraint exists and template is available
         if hybrid_constraint and hybrid_template:
@@ -104,7 +128,9 @@ def construct_callables(yaml_file):
                 step_temp=hybrid_constraint.get('step_temperature', 10),
                 temp_min=hybrid_constraint.get('temp_min', 600),
                 temp_max=hybrid_constraint.get('temp_max', 1200),
-                temp_step=hybrid_constraint.get('temp_step', 50)
+                temp_step=hybrid_constraint.get('temp_step', 50),
+                composition_tolerance=hybrid_constraint.get('composition_tolerance', 0),
+                liquidus_search=hybrid_constraint.get('liquidus_search', False)
             )
             
             hybrid_output_file = f"{output_dir}/hybrid_callable_{name}_{unique_id}.py"
@@ -62,7 +62,11 @@ def construct_callables(yaml_file):
                 elements=elements,
                 scheil_start_temperature=scheil_constraint.get('startTemperature', 2500),
                 liquid_phase_name=scheil_constraint.get('liquidPhase', 'LIQUID'),
-                step_temperature=scheil_constraint.get('step_temperature', 1)
+                step_temperature=scheil_constraint.get('step_temperature', 1),
+                adaptive=scheil_constraint.get('adaptive', False),
+                tolerance=scheil_constraint.get('tolerance', 0.02),
+                max_step_temperature=scheil_constraint.get('max_step_temperature', 20),
+                liquidus_search=scheil_constraint.get('liquidus_search', False)
             )
             
             scheil_output_file = f"{output_dir}/scheil_callable_{name}_{unique_id}.py"
@@ -61,7 +61,11 @@ def construct_callables(yaml_file):
                 elements=elements,
                 scheil_start_temperature=scheil_constraint.get('startTemperature', 2500),
                 liquid_phase_name=scheil_constraint.get('liquidPhase', 'LIQUID'),
-                step_temperature=scheil_constraint.get('step_temperature', 1)
+                step_temperature=scheil_constraint.get('step_temperature', 1),
+                adaptive=scheil_constraint.get('adaptive', False),
+                tolerance=scheil_constraint.get('tolerance', 0.02),
+                max_step_temperature=scheil_constraint.get('max_step_temperature', 20),
+                liquidus_search=scheil_constraint.get('liquidus_search', False)
             )
             scheil_output_file = f"{output_dir}/scheil_callable_{name}_{unique_id}.py"
             with open(scheil_output_file, 'w') as f:
@@ -78,7 +82,9 @@ def construct_callables(yaml_file):
                 step_temp=hybrid_constraint.get('step_temperature', 1),
                 temp_min=hybrid_constraint.get('temp_min', 500),
                 temp_max=hybrid_constraint.get('temp_max', 1000),
-                temp_step=hybrid_constraint.get('temp_step', 50)
+                temp_step=hybrid_constraint.get('temp_step', 50),
+                composition_tolerance=hybrid_constraint.get('composition_tolerance', 0),
+                liquidus_search=hybrid_constraint.get('liquidus_search', False)
             )
             hybrid_output_file = f"{output_dir}/hybrid_scheil_callable_{name}_{unique_id}.py"
             with open(hybrid_output_file, 'w') as f:
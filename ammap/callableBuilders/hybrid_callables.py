@@ -45,6 +45,8 @@ def construct_callables(yaml_file):
         temp_min = hybrid_constraint['temp_min']
         temp_max = hybrid_constraint['temp_max']
         temp_step = hybrid_constraint['temp_step']
+        composition_tolerance = hybrid_constraint.get('composition_tolerance', 0)
+        liquidus_search = hybrid_constraint.get('liquidus_search', False)
         
         # Generate a unique identifier based on elements and TDB file 
         unique_id = hashlib.sha256(f"{'-'.join(elements)}_{tdb_file}".encode()).hexdigest()[:8]
@@ -58,7 +60,9 @@ def construct_callables(yaml_file):
             step_temp=step_temp,
             temp_min=temp_min,
             temp_max=temp_max,
-            temp_step=temp_step
+            temp_step=temp_step,
+            composition_tolerance=composition_tolerance,
+            liquidus_search=liquidus_search
         )
         
         # Write the resulting script to a new file 
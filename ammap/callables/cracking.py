@@ -2,7 +2,6 @@
 ## CURRENTLY UNDER DEVELOPMENT AND UNTESTED ##
 
 # NEEDED inputs: solidus temperatures, liquidus temperatures, list of temperature, solid fractions
-from sklearn import neighbors
 import numpy as np
 import math
 
@@ -115,17 +114,14 @@ def getIntegral(temperature, solidFraction):
     Returns:
         dict: combined results of T and phase fraction
     """
-    result = 0
-    if len(temperature) > 3:
-        for i in range(len(temperature)):
-            if i == 0:
-                delT = abs((temperature[i+1] - temperature[i])/2)
-            elif i == len(temperature) - 1:
-                delT = abs((temperature[i] - temperature[i-1])/2)
-            else:
-                delT = abs((temperature[i+1]+temperature[i])/2-(temperature[i]+temperature[i-1])/2)
-            result += solidFraction[i] * delT
-    return result
+    temperature = np.asarray(temperature, dtype=float)
+    if len(temperature) <= 3:
+        return 0
+    delT = np.empty(len(temperature))
+    delT[0] = abs(temperature[1] - temperature[0]) / 2
+    delT[-1] = abs(temperature[-1] - temperature[-2]) / 2
+    delT[1:-1] = np.abs(temperature[2:] - temperature[:-2]) / 2
+    return float(np.dot(np.asarray(solidFraction, dtype=float), delT))
 
 
 def getCD(temperature, solidFraction, CDPoints = [0.7,0.98], numDataThreshold = 10):
@@ -138,46 +134,12 @@ def getCD(temperature, solidFraction, CDPoints = [0.7,0.98], numDataThreshold =
     CDPoints (list): A list of CD points defaulting to [0.7, 0.98].
 
     Returns:
-    tuple: A tuple containing two lists - CD1 (srdg) and CD2 (iCSC).
+    tuple: A tuple containing two lists - CD1 (srdg) and CD2 (iCSC), with None where they cannot be calculated.
 
     """
-    CDPoints.sort()
-    CD1 = [] # sRDG
-    CD2 = [] # iCSC
-    fs_0 = CDPoints[0]
-    fs_co = CDPoints[1]
-    for i in range(len(temperature)):
-        Temperature = temperature[i]
-        solidFrac = solidFraction[i]
-        if Temperature != None and len(Temperature) >= numDataThreshold:
-            T0 = np.interp(fs_0, solidFrac, Temperature)
-            Tco = np.interp(fs_co, solidFrac, Temperature)
-            for index in range(len(Temperature)):
-                if Temperature[index] <= T0:
-                    break
-            Temperature = Temperature[index:]
-            Temperature = Temperature[::-1]
-            solidFrac = solidFrac[index:]
-            solidFrac = solidFrac[::-1]
-            try:
-                deltT = min((T0 - Tco)/10,10)
-                Trange = [item for item in np.arange(Tco,T0+deltT,deltT)]
-                solidFrac_new = []
-                for item in Trange:
-                    solidFrac_new.append(np.interp(item, Temperature, solidFrac))
-                solidFrac = [item for item in solidFrac_new if item <= fs_co]
-                Trange = [Trange[i] for i in range(len(solidFrac))]
-                CD1.append(getIntegral(Trange, [item**2/(1-item)**2 for item in solidFrac]))
-                CD2.append(getIntegral(Trange, solidFrac))
-            except:
-                print(f'{i}th point cannot get sRDG and iCSC')
-                print(solidFrac[0],solidFrac[-1])
-                CD1.append(None)
-                CD2.append(None)
-        else:
-            print(f'{i}th point, data point {len(Temperature) } < {numDataThreshold}')
-            CD1.append(None)
-            CD2.append(None)
+    CD1, CD2 = getCDArray(*packCurves(temperature, solidFraction), CDPoints=CDPoints, numDataThreshold=numDataThreshold)
+    CD1 = [None if np.isnan(c) else float(c) for c in CD1]
+    CD2 = [None if np.isnan(c) else float(c) for c in CD2]
     return CD1, CD2
 #        if Temperature != None and len(Temperature) >= numDataThreshold and max(solidFrac) > max(CDPoints):
 #            n_neighbors = 2
@@ -202,10 +164,213 @@ def getCD(temperature, solidFraction, CDPoints = [0.7,0.98], numDataThreshold =
 #            CD2.append(None)
 #    return CD1, CD2
 
+def packCurves(temperature, solidFraction):
+    """Pack ragged Scheil curves into padded arrays for the vectorized criteria (``getCSCArray``, ``getKouArray``, ...).
+
+    Rows are padded by repeating their last value, so every row stays monotonic and can be interpolated as a whole.
+    The arrays have at least 2 columns, so interpolation has a segment to work on even when every curve is missing or
+    has a single point.
+
+    Args:
+        temperature (list): A list of temperature lists (None for missing results).
+        solidFraction (list): A list of solid fraction lists (None for missing results).
+
+    Returns:
+        tuple: Padded temperatures (n x L array), padded solid fractions (n x L array), and the number of valid values
+        of each row (n array, 0 for missing results).
+    """
+    lengths = np.array([0 if T is None else len(T) for T in temperature], dtype=int)
+    width = max(2, lengths.max(initial=0))
+    T = np.zeros((len(lengths), width))
+    fs = np.zeros((len(lengths), width))
+    for i, n in enumerate(lengths):
+        if n > 0:
+            T[i, :n] = temperature[i]
+            T[i, n:] = temperature[i][-1]
+            fs[i, :n] = solidFraction[i]
+            fs[i, n:] = solidFraction[i][-1]
+    return T, fs, lengths
+
+
+def _interpRows(x, xp, fp, lengths):
+    """Row-wise ``np.interp``: interpolates the queries ``x[i]`` (a 2-D array broadcastable to n x k) on the curve
+    ``xp[i], fp[i]`` of every row at once. ``xp`` rows must be non-decreasing (padded as in ``packCurves``). Rows with
+    no data give NaN."""
+    n, width = xp.shape
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    x = np.broadcast_to(x, (n, x.shape[1]))
+    rows = np.arange(n)
+    last = np.maximum(lengths - 1, 0)
+    # np.interp clamps to the end values, so clamping the queries first keeps every query inside its row's range
+    xq = np.clip(x, xp[:, :1], xp[rows, last][:, None])
+    # Offsetting every row by more than the total span makes the flattened padded array globally sorted
+    low = xp.min()
+    span = xp.max() - low + 1.0
+    offsets = (rows * span)[:, None]
+    position = np.searchsorted((xp - low + offsets).ravel(), (xq - low + offsets).ravel(), side='right')
+    j = np.clip(position.reshape(xq.shape) - (rows * width)[:, None], 1, np.maximum(last, 1)[:, None])
+    lo, hi = j - 1, j
+    x0, x1 = xp[rows[:, None], lo], xp[rows[:, None], hi]
+    f0, f1 = fp[rows[:, None], lo], fp[rows[:, None], hi]
+    # Same operation order as np.interp, so results match it to the last bit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(x1 > x0, (f1 - f0) / (x1 - x0) * (xq - x0) + f0, f1)
+    result[lengths == 1] = fp[lengths == 1, :1]
+    result[lengths == 0] = np.nan
+    return result
+
+
+def getFRArray(solidT, liquidT):
+    """Freezing range criteria for the whole grid at once; like ``getFR`` but returns an array with NaN instead of
+    None."""
+    solidT = np.array([np.nan if T is None else T for T in solidT], dtype=float)
+    liquidT = np.array([np.nan if T is None else T for T in liquidT], dtype=float)
+    return liquidT - solidT
+
+
+def getCSCArray(T, fs, lengths, CSCPoints=(0.4, 0.9, 0.99), numDataThreshold=10):
+    """Critical Solidification Criteria for the whole grid at once; vectorized ``getCSC``.
+
+    Args:
+        T, fs, lengths: Packed Scheil curves from ``packCurves``.
+        CSCPoints (list, optional): Solid fractions defining the criterion. Defaults to [0.4, 0.9, 0.99].
+        numDataThreshold (int, optional): Minimum number of points in a curve. Defaults to 10.
+
+    Returns:
+        np.ndarray: CSC values, NaN where the criterion is undefined.
+    """
+    points = sorted(CSCPoints)
+    maxFs = np.where(lengths > 0, fs.max(axis=1), -np.inf)
+    valid = (lengths >= numDataThreshold) & (maxFs > points[2])
+    T3, T2, T1 = _interpRows(np.array(points)[None, :], fs, T, lengths).T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CSC = (T1 - T2) / (T2 - T3)
+    return np.where(valid & np.isfinite(CSC), CSC, np.nan)
+
+
+def getKouArray(T, fs, lengths, KouPoints=(0.93, 0.98), numDataThreshold=10):
+    """Kou criterion for the whole grid at once; vectorized ``getKou``.
+
+    Args:
+        T, fs, lengths: Packed Scheil curves from ``packCurves``.
+        KouPoints (list, optional): Solid fractions defining the criterion. Defaults to [0.93, 0.98].
+        numDataThreshold (int, optional): Minimum number of points in a curve. Defaults to 10.
+
+    Returns:
+        np.ndarray: Kou values, NaN where the criterion is undefined.
+    """
+    points = sorted(KouPoints)
+    T2, T1 = _interpRows(np.array(points)[None, :], fs, T, lengths).T
+    Kou = np.abs((T1 - T2) / (points[1]**0.5 - points[0]**0.5))
+    return np.where((lengths >= numDataThreshold) & np.isfinite(Kou), Kou, np.nan)
+
+
+def getCDArray(T, fs, lengths, CDPoints=(0.7, 0.98), numDataThreshold=10):
+    """sRDG and iCSC for the whole grid at once; vectorized ``getCD``.
+
+    Every curve is resampled between the temperatures of the two CD points with a fixed step of
+    ``min((T0 - Tco)/10, 10)`` in a single interpolation over all rows, and the solid fractions (and sRDG integrand)
+    are integrated with trapezoid weights, as ``getIntegral`` does point by point. The first sample lies at ``fs_co``
+    up to rounding, so whether the cut at ``fs_co`` keeps it is decided by rounding; it is interpolated on the ascending
+    curve exactly as in the original point-by-point ``getCD``, so the same samples are kept.
+
+    Args:
+        T, fs, lengths: Packed Scheil curves from ``packCurves``.
+        CDPoints (list, optional): Solid fractions defining the integration range. Defaults to [0.7, 0.98].
+        numDataThreshold (int, optional): Minimum number of points in a curve. Defaults to 10.
+
+    Returns:
+        tuple: sRDG and iCSC arrays, NaN where they cannot be calculated.
+    """
+    fs_0, fs_co = sorted(CDPoints)
+    n, width = T.shape
+    rows = np.arange(n)
+    T0, Tco = _interpRows(np.array([[fs_0, fs_co]]), fs, T, lengths).T
+    # The curve is cut at its first temperature not above T0; beyond it, np.interp clamps to that point
+    belowT0 = (T <= T0[:, None]) & (np.arange(width)[None, :] < lengths[:, None])
+    first = np.where(belowT0.any(axis=1), belowT0.argmax(axis=1), np.maximum(lengths - 1, 0))
+    T_first = T[rows, first]
+
+    deltT = np.minimum((T0 - Tco) / 10, 10)
+    valid = (lengths >= numDataThreshold) & np.isfinite(deltT) & (deltT != 0)
+    deltT = np.where(valid, deltT, 1.0)
+    # Same number of samples as np.arange(Tco, T0 + deltT, deltT)
+    nSteps = np.where(valid, np.maximum(np.ceil((T0 + deltT - Tco) / deltT), 0), 0).astype(int)
+    steps = np.arange(max(1, nSteps.max(initial=0)))
+    Trange = Tco[:, None] + steps[None, :] * deltT[:, None]
+    inRange = steps[None, :] < nSteps[:, None]
+
+    # Temperature decreases along each curve, so interpolating on -T keeps the abscissa non-decreasing
+    queries = -np.minimum(Trange, T_first[:, None])
+    solidFrac = _interpRows(queries, -T, fs, lengths)
+    # The first sample sits on the fs_co cut: interpolate it on the ascending (flipped) curve, as getCD did. The padding
+    # moves to the front of the flipped rows and only repeats their first point, so the whole rows can be used
+    cut = _interpRows(np.minimum(Tco, T_first)[:, None], T[:, ::-1], fs[:, ::-1], np.where(lengths > 0, width, 0))
+    solidFrac[:, 0] = np.where(valid, cut[:, 0], solidFrac[:, 0])
+    kept = inRange & (solidFrac <= fs_co)
+    # Kept solid fractions are paired with the first len(kept) temperatures of the range, as in getCD
+    order = np.argsort(~kept, axis=1, kind='stable')
+    solidFrac = np.where(np.take_along_axis(kept, order, axis=1), np.take_along_axis(solidFrac, order, axis=1), 0.0)
+    m = kept.sum(axis=1)
+
+    weights = np.where(steps[None, :] < m[:, None], deltT[:, None], 0.0)
+    weights[rows, 0] /= 2
+    weights[rows, np.maximum(m - 1, 0)] /= 2
+    weights[m <= 3] = 0.0
+    sRDG = (weights * solidFrac**2 / (1 - solidFrac)**2).sum(axis=1)
+    iCSC = (weights * solidFrac).sum(axis=1)
+    return np.where(valid, sRDG, np.nan), np.where(valid, iCSC, np.nan)
+
+
+def _neighborInterpRows(x, xp, fp, lengths):
+    """Distance-weighted 2-nearest-neighbor regression of ``fp`` on ``xp`` for every row at once, reproducing
+    ``sklearn.neighbors.KNeighborsRegressor(2, weights='distance')`` fitted per row: the two samples closest to each
+    query are found by binary search on the sorted row, weighted by inverse distance, and an exact hit takes the value
+    of the sample(s) at zero distance.
+
+    Args:
+        x (np.ndarray): Queries, 2-D array broadcastable to n x k.
+        xp, fp, lengths: Packed curves (as from ``packCurves``); rows need at least 2 values.
+
+    Returns:
+        np.ndarray: n x k array of predictions.
+    """
+    n, width = xp.shape
+    x = np.broadcast_to(np.atleast_2d(np.asarray(x, dtype=float)), (n, np.atleast_2d(x).shape[1]))
+    rows = np.arange(n)[:, None]
+    # Sort every row by xp, pushing padding to the end
+    padded = np.arange(width)[None, :] >= lengths[:, None]
+    order = np.argsort(np.where(padded, np.inf, xp), axis=1, kind='stable')
+    xs = np.where(padded, np.inf, xp)[rows, order]
+    fs = fp[rows, order]
+    # Padding repeats the largest value of the row, which keeps the rows sorted for the flattened search below
+    xs = np.where(padded, np.where(lengths > 0, xs[rows[:, 0], np.maximum(lengths - 1, 0)], 0.0)[:, None], xs)
+    # Offsetting every row by more than the span of samples and queries makes the flattened array globally sorted
+    low = min(xs.min(), x.min())
+    span = max(xs.max(), x.max()) - low + 1.0
+    offsets = rows * span
+    position = np.searchsorted((xs - low + offsets).ravel(), (x - low + offsets).ravel(), side='left')
+    position = np.minimum(position.reshape(x.shape) - rows * width, lengths[:, None])
+    # The two nearest samples lie among the two on either side of the insertion point
+    candidates = position[:, :, None] + np.arange(-2, 2)[None, None, :]
+    inRange = (candidates >= 0) & (candidates < lengths[:, None, None])
+    candidates = np.clip(candidates, 0, np.maximum(lengths - 1, 0)[:, None, None])
+    distance = np.where(inRange, np.abs(xs[rows[:, :, None], candidates] - x[:, :, None]), np.inf)
+    nearest = np.argsort(distance, axis=2, kind='stable')[:, :, :2]
+    d = np.take_along_axis(distance, nearest, axis=2)
+    y = fs[rows[:, :, None], np.take_along_axis(candidates, nearest, axis=2)]
+    with np.errstate(divide='ignore'):
+        w = 1.0 / d
+    exact = np.isinf(w)
+    w = np.where(exact.any(axis=2, keepdims=True), exact.astype(float), w)
+    return (w * y).sum(axis=2) / w.sum(axis=2)
+
+
 def getNeighborCSC(temperature, solidFraction, CSCPoints=[0.4,0.9,0.99],numDataThreshold = 10):
     """Calculate the Critical Solidification Criteria.
 
-    This function calculates the critical solidification criteria based on the given temperature and solid fraction.
+    This function calculates the critical solidification criteria based on the given temperature and solid fraction,
+    using distance-weighted 2-nearest-neighbor interpolation of the temperatures.
 
     Args:
         temperature (list): A list of temperature values.
@@ -215,39 +380,19 @@ def getNeighborCSC(temperature, solidFraction, CSCPoints=[0.4,0.9,0.99],numDataT
     Returns:
         list: A list of critical solidification criteria values.
     """
-    CSCPoints.sort()
-    T1 = []
-    T2 = []
-    T3 = []
-    for i in range(len(temperature)):
-        Temperature = temperature[i]
-        solidFrac = solidFraction[i]
-
-        if Temperature != None and len(Temperature) >= numDataThreshold and max(solidFrac) > max(CSCPoints):
-            n_neighbors = 2
-            weights = 'distance'
-            model = neighbors.KNeighborsRegressor(n_neighbors, weights=weights).fit(np.array(solidFrac).reshape(-1, 1), Temperature)
-            T1.append(model.predict(np.array([CSCPoints[2]]).reshape(-1, 1))[0])
-            T2.append(model.predict(np.array([CSCPoints[1]]).reshape(-1, 1))[0])
-            T3.append(model.predict(np.array([CSCPoints[0]]).reshape(-1, 1))[0])
-        else:
-            T1.append(None)
-            T2.append(None)
-            T3.append(None)
-    CSC = []
-    for i in range(len(T1)):
-        if T1[i] != None:
-            try:
-                CSC.append((T1[i]-T2[i])/(T2[i]-T3[i]))
-            except:
-                CSC.append(None)
-        else:
-            CSC.append(None)
-    return CSC
+    points = sorted(CSCPoints)
+    T, fs, lengths = packCurves(temperature, solidFraction)
+    maxFs = np.where(lengths > 0, fs.max(axis=1), -np.inf)
+    valid = (lengths >= numDataThreshold) & (maxFs > points[2])
+    T3, T2, T1 = _neighborInterpRows(np.array(points)[None, :], fs, T, np.where(valid, lengths, 2)).T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CSC = (T1 - T2) / (T2 - T3)
+    return [float(c) if ok else None for c, ok in zip(CSC, valid)]
 
 def getNeighborKou(temperature, solidFraction, KouPoints= [0.93,0.98], numDataThreshold = 10):
     """
-    Calculate the Kou value for each temperature and solid fraction pair.
+    Calculate the Kou value for each temperature and solid fraction pair, using distance-weighted 2-nearest-neighbor
+    interpolation of the temperatures.
 
     Args:
         temperature (list): A list of temperatures.
@@ -257,31 +402,10 @@ def getNeighborKou(temperature, solidFraction, KouPoints= [0.93,0.98], numDataTh
     Returns:
         list: A list of Kou values corresponding to each temperature and solid fraction pair.
     """
-    KouPoints.sort()
-    T1 = []
-    T2 = []
-    solid1 = []
-    solid2 = []
-    for i in range(len(temperature)):
-        Temperature = temperature[i]
-        solidFrac = solidFraction[i]
-        if Temperature != None and len(Temperature) >= numDataThreshold and max(solidFrac) > max(KouPoints):
-            n_neighbors = 2
-            weights = 'distance'
-            model = neighbors.KNeighborsRegressor(n_neighbors, weights=weights).fit(np.array(solidFrac).reshape(-1, 1), Temperature)
-            T1.append(model.predict(np.array([KouPoints[1]]).reshape(-1, 1))[0])
-            T2.append(model.predict(np.array([KouPoints[0]]).reshape(-1, 1))[0])
-            solid1.append(KouPoints[1])
-            solid2.append(KouPoints[0])
-        else:
-            T1.append(None)
-            T2.append(None)
-            solid1.append(None)
-            solid2.append(None)
-    Kou = []
-    for i in range(len(T1)):
-        if T1[i] != None:
-            Kou.append(abs((T1[i]-T2[i])/((solid1[i]**0.5-solid2[i]**0.5))))
-        else:
-            Kou.append(None)
-    return Kou
+    points = sorted(KouPoints)
+    T, fs, lengths = packCurves(temperature, solidFraction)
+    maxFs = np.where(lengths > 0, fs.max(axis=1), -np.inf)
+    valid = (lengths >= numDataThreshold) & (maxFs > points[1])
+    T2, T1 = _neighborInterpRows(np.array(points)[None, :], fs, T, np.where(valid, lengths, 2)).T
+    Kou = np.abs((T1 - T2) / (points[1]**0.5 - points[0]**0.5))
+    return [float(k) if ok else None for k, ok in zip(Kou, valid)]
@@ -0,0 +1,265 @@
+# Solidification helpers shared by the generated Scheil and hybrid Scheil-equilibrium callables.
+#
+# The generated callables pass in their own pycalphad objects as ``thermo``, a dictionary with the 'dbf', 'comps',
+# 'phases_filtered', 'models' and 'phase_records' of their elemental space.
+import math
+
+import numpy as np
+from pycalphad import equilibrium, variables as v
+
+
+def _liquidMask(thermo, composition, temperatures, liquidPhase):
+    """Whether the composition is fully liquid at each of the ``temperatures``, solved in one equilibrium call."""
+    temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    conds = {v.T: temperatures, v.P: 101325, v.N: 1.0, **composition}
+    eq = equilibrium(thermo['dbf'], thermo['comps'], thermo['phases_filtered'], conds,
+                     model=thermo['models'], phase_records=thermo['phase_records'])
+    phases = eq.Phase.values.reshape(len(temperatures), -1)
+    return np.array([{str(phase) for phase in row if phase} == {liquidPhase} for row in phases])
+
+
+def find_liquidus(thermo, composition, upper, resolution, hint=None, lower=300.0, liquidPhase='LIQUID',
+                  scanStep=50.0):
+    """
+    Locate the liquidus of a composition to within ``resolution``, so a stepped Scheil simulation can start right above
+    it instead of stepping through the fully liquid region.
+
+    A coarse scan first solves temperatures ``scanStep`` apart from ``upper`` down to ``lower`` in a single vectorized
+    equilibrium call, and brackets the liquidus between the lowest temperature of the fully liquid top of the scan and
+    the next one down; only that bracket is then bisected with single-point equilibria. With a liquidus ``hint`` (e.g.
+    from a neighboring composition), the scan covers just two scan steps on either side of the hint, and falls back to
+    the full range when the liquidus is not inside that window.
+
+    Args:
+        thermo: pycalphad objects of the elemental space (see the module comment).
+        composition: Conditions of the independent mole fractions, e.g. ``{v.X('CR'): 0.2, v.X('FE'): 0.2}``.
+        upper: Highest temperature considered, usually the configured start temperature.
+        resolution: Largest distance between the returned temperature and the liquidus.
+        hint: Optional liquidus estimate.
+        lower: Lowest temperature considered.
+        liquidPhase: Name of the liquid phase.
+        scanStep: Temperature step of the coarse scan.
+
+    Returns:
+        float: A fully liquid temperature at most ``resolution`` above the liquidus, or None if ``upper`` itself is not
+        fully liquid.
+    """
+    upper, lower = float(upper), float(lower)
+    bracket = None
+    if hint is not None and lower < float(hint) < upper:
+        window = np.arange(min(upper, float(hint) + 2 * scanStep), max(lower, float(hint) - 2 * scanStep), -scanStep)
+        temperatures = np.unique(np.concatenate(([upper], window)))[::-1]
+        bracket = _scanBracket(thermo, composition, temperatures, lower, liquidPhase)
+        if bracket is None:
+            return None
+        if bracket[0] - bracket[1] > scanStep:
+            # The liquidus is not inside the window
+            bracket = None
+    if bracket is None:
+        bracket = _scanBracket(thermo, composition, np.arange(upper, lower, -scanStep), lower, liquidPhase)
+        if bracket is None:
+            return None
+
+    high, low = bracket
+    while high - low > resolution:
+        middle = (high + low) / 2
+        if _liquidMask(thermo, composition, middle, liquidPhase)[0]:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def _scanBracket(thermo, composition, temperatures, lower, liquidPhase):
+    """(high, low) around the end of the fully liquid top of a descending scan, or None if it starts below it."""
+    liquid = _liquidMask(thermo, composition, temperatures, liquidPhase)
+    if not liquid[0]:
+        return None
+    solid = np.flatnonzero(~liquid)
+    if len(solid) == 0:
+        # Fully liquid down to the end of the scan: the liquidus lies below its last temperature
+        return float(temperatures[-1]), lower
+    return float(temperatures[solid[0] - 1]), float(temperatures[solid[0]])
+
+
+def solve_local_equilibria(thermo, local_compositions, T_eq_array):
+    """
+    Solves every (local composition, temperature) cell with as few equilibrium calls as possible, grouped like
+    ``equilibrium_batch``: pycalphad broadcasts conditions as an outer product, so local compositions sharing all but
+    one independent mole fraction (the one giving the fewest groups) are solved in a single call vectorized over the
+    temperature array and that mole fraction. With a single independent mole fraction, all cells take one call.
+
+    Args:
+        thermo: pycalphad objects of the elemental space (see the module comment).
+        local_compositions: Local compositions, each with a 'composition' dictionary of independent mole fraction
+            conditions (the same variables, in the same order, for all of them).
+        T_eq_array: Temperatures to solve every local composition at.
+
+    Returns:
+        tuple: ``cells``, a (local composition x temperature) nested list of ``{phase: amount}`` dictionaries (None
+        for failed cells), and ``failed_cells``, a list of ``{'composition_index', 'temperature', 'error'}``
+        dictionaries.
+    """
+    n_T = len(T_eq_array)
+    cells = [[None] * n_T for _ in local_compositions]
+    failed_cells = []
+
+    def fail(c, t, error):
+        failed_cells.append({'composition_index': c, 'temperature': float(T_eq_array[t]), 'error': error})
+
+    def store(c, phase_data, np_data):
+        # phase_data, np_data: (temperature, vertex) arrays of one local composition
+        for t in range(n_T):
+            amounts = {}
+            for phase, amount in zip(phase_data[t], np_data[t]):
+                # Like before, the first vertex of a phase gives its amount
+                if str(phase) != '' and not math.isnan(amount) and str(phase) not in amounts:
+                    amounts[str(phase)] = float(amount)
+            if amounts:
+                cells[c][t] = amounts
+            else:
+                fail(c, t, 'No converged phases')
+
+    x_vars = list(local_compositions[0]['composition']) if local_compositions else []
+    X = np.array([[local_data['composition'][x] for x in x_vars] for local_data in local_compositions], dtype=float)
+    axis = 0
+    if len(local_compositions) > 1 and len(x_vars) > 1:
+        groupCounts = [len(set(map(tuple, np.delete(X, a, axis=1)))) for a in range(len(x_vars))]
+        axis = int(np.argmin(groupCounts))
+    groups = {}
+    for c, row in enumerate(X):
+        groups.setdefault(tuple(val for idx, val in enumerate(row) if idx != axis), []).append(c)
+
+    def solve(members):
+        axisValues = np.unique(X[members, axis])
+        conds = {v.T: T_eq_array, v.P: 101325, v.N: 1.0}
+        for idx, x in enumerate(x_vars):
+            conds[x] = axisValues if idx == axis else float(X[members[0], idx])
+        eq = equilibrium(thermo['dbf'], thermo['comps'], thermo['phases_filtered'], conds,
+                         model=thermo['models'], phase_records=thermo['phase_records'])
+        others = {str(x): 0 for idx, x in enumerate(x_vars) if idx != axis}
+        phase_arr = eq.Phase.isel(N=0, P=0, **others).transpose(str(x_vars[axis]), 'T', 'vertex').values
+        np_arr = eq.NP.isel(N=0, P=0, **others).transpose(str(x_vars[axis]), 'T', 'vertex').values
+        for c in members:
+            idx = int(np.searchsorted(axisValues, X[c, axis]))
+            store(c, phase_arr[idx], np_arr[idx])
+
+    for members in groups.values():
+        try:
+            solve(members)
+        except Exception as e:
+            if len(members) == 1:
+                for t in range(n_T):
+                    fail(members[0], t, str(e))
+                continue
+            # Fall back to one call per local composition so failures are attributed to cells
+            for c in members:
+                try:
+                    solve([c])
+                except Exception as e:
+                    for t in range(n_T):
+                        fail(c, t, str(e))
+    return cells, failed_cells
+
+
+def integrate_phase_fractions(cells, weights):
+    """
+    Weighted average over local compositions of the amount of every phase at every temperature, taken over the cells
+    where the phase is present and normalized to a sum of 1.
+
+    Returns:
+        tuple: Phase names, the (temperature x phase) integrated fractions, the (temperature x phase) mask of phases
+        present in any cell, and the number of successful cells per temperature.
+    """
+    phase_names = sorted({phase for row in cells for cell in row if cell for phase in cell})
+    amounts = np.zeros((len(cells), len(cells[0]), len(phase_names)))
+    present = np.zeros(amounts.shape, dtype=bool)
+    for c, row in enumerate(cells):
+        for t, cell in enumerate(row):
+            for phase, amount in (cell or {}).items():
+                amounts[c, t, phase_names.index(phase)] = amount
+                present[c, t, phase_names.index(phase)] = True
+    w = np.asarray(weights, dtype=float)[:, None, None]
+    weighted_sum = (amounts * present * w).sum(axis=0)
+    contributing_weight = (present * w).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        integrated = np.where(contributing_weight > 0, weighted_sum / contributing_weight, 0.0)
+        total = integrated.sum(axis=1, keepdims=True)
+        integrated = np.where(total > 0, integrated / total, integrated)
+    successful = np.array([[cell is not None for cell in row] for row in cells]).sum(axis=0)
+    return phase_names, integrated, present.any(axis=0), successful
+
+
+def merge_local_compositions(local_compositions, tolerance):
+    """
+    Merges runs of consecutive local compositions (along the solidification path) whose independent mole fractions
+    all stay within ``tolerance`` of the first composition of the run into their solid-fraction weighted mean. The
+    merged composition carries the summed weight, so the integration is unchanged apart from the composition shift.
+
+    Returns:
+        tuple: The merged local compositions and, for each of them, its radius: the largest mole fraction difference
+        between the merged composition and any composition it replaces.
+    """
+    if tolerance <= 0 or len(local_compositions) < 2:
+        return local_compositions, np.zeros(len(local_compositions))
+    x_vars = list(local_compositions[0]['composition'])
+    X = np.array([[local_data['composition'][x] for x in x_vars] for local_data in local_compositions], dtype=float)
+    w = np.array([local_data['solid_fraction'] for local_data in local_compositions], dtype=float)
+    runs = [[0]]
+    for i in range(1, len(X)):
+        if np.abs(X[i] - X[runs[-1][0]]).max() <= tolerance:
+            runs[-1].append(i)
+        else:
+            runs.append([i])
+
+    merged, radii = [], []
+    for run in runs:
+        mean = np.average(X[run], axis=0, weights=w[run]) if w[run].sum() > 0 else X[run].mean(axis=0)
+        merged.append({
+            **local_compositions[run[0]],
+            'solid_fraction': float(w[run].sum()),
+            'composition': dict(zip(x_vars, mean.tolist())),
+            'total_solid': float(sum(local_compositions[i]['total_solid'] for i in run)),
+            'merged_count': len(run)
+        })
+        radii.append(np.abs(X[run] - mean).max())
+    return merged, np.array(radii)
+
+
+def estimate_merge_error(local_compositions, radii, cells, weights):
+    """
+    Estimate, per temperature, how much merging local compositions (see ``merge_local_compositions``) changed the
+    integrated phase fractions. This is a first-order estimate, not a bound: the phase amounts of every merged
+    composition are moved by its radius towards those of the previous (or next) composition along the path, assuming
+    they change linearly in between, and the largest resulting change of any integrated phase fraction is reported.
+    Phase amounts that change faster than that within a merged run, e.g. a phase appearing inside it, are missed.
+
+    Args:
+        local_compositions: Merged local compositions, in order along the solidification path.
+        radii: Radius of every merged composition, as returned by ``merge_local_compositions``.
+        cells: Their solved cells, as returned by ``solve_local_equilibria``.
+        weights: Their integration weights.
+
+    Returns:
+        np.ndarray: Estimated change of the integrated phase fractions for every temperature.
+    """
+    phase_names, integrated, _, _ = integrate_phase_fractions(cells, weights)
+    reference = dict(zip(phase_names, integrated.T))
+    X = np.array([list(local_data['composition'].values()) for local_data in local_compositions], dtype=float)
+    error = np.zeros(len(cells[0]))
+    for direction in (-1, 1):
+        shifted = [list(row) for row in cells]
+        for c in range(len(cells)):
+            n = c + direction
+            if radii[c] == 0 or not 0 <= n < len(cells):
+                continue
+            distance = np.abs(X[n] - X[c]).max()
+            share = min(radii[c] / distance, 1.0) if distance > 0 else 0.0
+            for t, (cell, other) in enumerate(zip(cells[c], cells[n])):
+                if cell and other:
+                    shifted[c][t] = {phase: cell.get(phase, 0.0) + (other.get(phase, 0.0) - cell.get(phase, 0.0)) * share
+                                     for phase in set(cell) | set(other)}
+        names, perturbed, _, _ = integrate_phase_fractions(shifted, weights)
+        for k, phase in enumerate(names):
+            error = np.maximum(error, np.abs(perturbed[:, k] - reference.get(phase, 0.0)))
+    return error
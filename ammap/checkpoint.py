@@ -0,0 +1,119 @@
+"""Incremental, append-only checkpointing of compositional graph explorations.
+
+A checkpoint at ``path`` consists of three files:
+
+- ``path.log``: append-only JSON-lines log with one record ``{"i": node, "f": feasible, "r": result}`` per completed
+  node. This is the source of truth.
+- ``path.bits``: fixed-size file with an 8-byte header (length of the log covered so far) followed by two packed
+  bitsets over all graph nodes: completed nodes and feasible nodes. It is updated in place, one byte per point.
+- ``path.seeds.json``: starting nodes of the exploration.
+
+Writing a completed point thus costs one log line and a constant-size in-place update, instead of re-serializing the
+whole exploration state. After a crash, the log tail not yet reflected in the bitsets is replayed, and exploration
+resumes from the exact frontier: uncompleted seeds plus uncompleted neighbors of feasible completed nodes.
+"""
+import os
+import json
+
+import numpy as np
+
+from ammap.store import _jsonable
+
+
+class ExplorationCheckpoint:
+    """Append-only checkpoint of an exploration over a graph with ``nNodes`` nodes, created or resumed at ``path``."""
+    def __init__(self, path, nNodes):
+        self.path = path
+        self.nNodes = nNodes
+        self.logPath = f"{path}.log"
+        self.bitsPath = f"{path}.bits"
+        self.seedsPath = f"{path}.seeds.json"
+        nBytes = (nNodes + 7) // 8
+
+        if not os.path.exists(self.bitsPath):
+            with open(self.bitsPath, 'wb') as f:
+                f.write(bytes(8 + 2 * nBytes))
+        self._bits = np.memmap(self.bitsPath, dtype=np.uint8, mode='r+')
+        if len(self._bits) != 8 + 2 * nBytes:
+            raise ValueError(f"Checkpoint {path} was written for a graph of a different size")
+        self._logOffset = self._bits[:8].view(np.uint64)
+        self._completed = self._bits[8:8 + nBytes]
+        self._feasible = self._bits[8 + nBytes:]
+
+        self._recover()
+        self._log = open(self.logPath, 'ab')
+
+    def _set(self, node, feasible):
+        byte, mask = node >> 3, np.uint8(1 << (node & 7))
+        self._completed[byte] |= mask
+        if feasible:
+            self._feasible[byte] |= mask
+
+    def _recover(self):
+        """Replay log records written after the last bitset update and drop a partially written last line."""
+        if not os.path.exists(self.logPath):
+            open(self.logPath, 'wb').close()
+        offset = int(self._logOffset[0])
+        with open(self.logPath, 'rb+') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                record = json.loads(line)
+                self._set(record['i'], record['f'])
+                offset += len(line)
+            f.truncate(offset)
+        self._logOffset[0] = offset
+        self._bits.flush()
+
+    def append(self, node, feasible, result):
+        """Record a completed node. Constant-size apart from the result itself."""
+        self._log.write((json.dumps({'i': int(node), 'f': bool(feasible), 'r': _jsonable(result)}) + '\n').encode())
+        self._log.flush()
+        self._set(int(node), feasible)
+        self._logOffset[0] = self._log.tell()
+
+    @property
+    def completed(self):
+        """Boolean array of completed nodes."""
+        return np.unpackbits(self._completed, count=self.nNodes, bitorder='little').astype(bool)
+
+    @property
+    def feasible(self):
+        """Boolean array of completed feasible nodes."""
+        return np.unpackbits(self._feasible, count=self.nNodes, bitorder='little').astype(bool)
+
+    @property
+    def seeds(self):
+        if not os.path.exists(self.seedsPath):
+            return []
+        with open(self.seedsPath, 'r') as f:
+            return json.load(f)
+
+    def add_seeds(self, nodes):
+        """Persist starting nodes (merged with those already recorded)."""
+        seeds = sorted(set(self.seeds) | {int(n) for n in nodes})
+        with open(f"{self.seedsPath}.tmp", 'w') as f:
+            json.dump(seeds, f)
+        os.replace(f"{self.seedsPath}.tmp", self.seedsPath)
+
+    def frontier(self, graph):
+        """Nodes to (re)submit when resuming: uncompleted seeds and uncompleted neighbors of feasible completed nodes
+        of a ``CompositionalGraph``."""
+        completed = self.completed
+        targets = graph.indices[self.feasible[graph.edge_sources()]]
+        candidates = np.union1d(targets, np.asarray(self.seeds, dtype=np.int64))
+        return [int(n) for n in candidates if not completed[n]]
+
+    def iter_results(self):
+        """Yield ``(node, feasible, result)`` for every completed node, in completion order."""
+        with open(self.logPath, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                record = json.loads(line)
+                yield record['i'], record['f'], record['r']
+
+    def close(self):
+        self._log.close()
+        self._bits.flush()
@@ -1,3 +1,12 @@
+import os
+import time
+import json
+import shutil
+import hashlib
+import tempfile
+import itertools
+from concurrent.futures import wait, FIRST_COMPLETED
+
 import yaml
 import numpy as np
 import pandas as pd
@@ -5,9 +14,153 @@ import pandas as pd
 
 import nimplex
 from utils import plotting
+from ammap.executor import CallableExecutor
+from ammap.checkpoint import ExplorationCheckpoint
+from ammap.pathplanning import nearest_node, lazy_astar
+
+
+class CompositionalGraph:
+    """
+    Compositional graph of a design space stored compactly: the adjacency in CSR form (``indptr`` and ``indices``
+    int32 arrays, neighbors of node ``i`` being ``indices[indptr[i]:indptr[i+1]]``), and the compositions and
+    attainable-space grid coordinates as NumPy arrays (``compositionArray``, ``gridAttArray``).
+
+    Dictionary-style access used throughout the notebooks (``graph['graphN']``, ``graph['edges']``,
+    ``graph['compositions']``, ``graph['gridAtt']``, ``graph['components_master']``) keeps working; the Python list
+    views are generated on demand and never stored.
+    """
+    _views = ('edges', 'graphN', 'compositions', 'gridAtt', 'components_master')
+
+    def __init__(self, indptr, indices, compositionArray, gridAttArray, components_master):
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.compositionArray = np.asarray(compositionArray, dtype=float)
+        self.gridAttArray = np.asarray(gridAttArray, dtype=np.int32)
+        self.components_master = components_master
+        self._maxEdgeLength = None
+
+    @classmethod
+    def from_adjacency(cls, nList, compositions, gridAtt, components_master):
+        """Build the graph from nimplex neighbor lists (``nList``) without materializing an edge list."""
+        counts = np.fromiter((len(n) for n in nList), dtype=np.int32, count=len(nList))
+        indptr = np.zeros(len(nList) + 1, dtype=np.int32)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.fromiter(itertools.chain.from_iterable(nList), dtype=np.int32, count=int(indptr[-1]))
+        return cls(indptr, indices, compositions, gridAtt, components_master)
+
+    @property
+    def nNodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nEdges(self):
+        return len(self.indices)
+
+    def neighbors(self, i):
+        """Neighbor node indices of node ``i`` as an int32 array view."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def edge_sources(self):
+        """Source node of every edge, aligned with ``indices`` (the edge targets)."""
+        return np.repeat(np.arange(self.nNodes, dtype=np.int32), np.diff(self.indptr))
+
+    def max_edge_length(self):
+        """Largest L1 composition distance spanned by a single edge, computed once per graph."""
+        if self._maxEdgeLength is None:
+            step = np.abs(self.compositionArray[self.edge_sources()] - self.compositionArray[self.indices]).sum(axis=1)
+            self._maxEdgeLength = float(step.max(initial=0.0))
+        return self._maxEdgeLength
+
+    def __getitem__(self, key):
+        if key == 'edges':
+            return list(zip(self.edge_sources().tolist(), self.indices.tolist()))
+        if key == 'graphN':
+            return [self.indices[self.indptr[i]:self.indptr[i + 1]].tolist() for i in range(self.nNodes)]
+        if key == 'compositions':
+            return self.compositionArray.tolist()
+        if key == 'gridAtt':
+            return self.gridAttArray.tolist()
+        if key == 'components_master':
+            return self.components_master
+        raise KeyError(key)
+
+    def save(self, directory):
+        """Write the graph arrays as ``.npy`` files (plus ``components_master.json``) into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'indptr.npy'), self.indptr)
+        np.save(os.path.join(directory, 'indices.npy'), self.indices)
+        np.save(os.path.join(directory, 'compositions.npy'), self.compositionArray)
+        np.save(os.path.join(directory, 'gridAtt.npy'), self.gridAttArray)
+        with open(os.path.join(directory, 'components_master.json'), 'w') as f:
+            json.dump(self.components_master, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Load a graph written by ``save``. Arrays are memory-mapped (read-only) by default."""
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in ('indptr', 'indices', 'compositions', 'gridAtt')]
+        with open(os.path.join(directory, 'components_master.json'), 'r') as f:
+            components_master = json.load(f)
+        return cls(*arrays, components_master)
+
+    def __contains__(self, key):
+        return key in self._views
+
+    def keys(self):
+        return list(self._views)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def is_feasible(result, feasiblePhases, liquidPhase='LIQUID'):
+    """
+    Decide if a callable result is feasible, i.e. only phases from ``feasiblePhases`` are present. Works for outputs
+    of all generated callables: equilibrium (list of per-temperature records, where temperatures with liquid present
+    are skipped), early-exit equilibrium (``Feasible``, decided by the callable itself), single-temperature
+    equilibrium, Scheil (``finalPhase``), hybrid Scheil-equilibrium (``equilibrium_results``), and combined (feasible
+    if all of its ``equilibrium`` and ``scheil`` stages are). Failed calculations (None, errors, no phases) are
+    infeasible.
+    """
+    allowed = set(feasiblePhases)
+    if result is None:
+        return False
+    if isinstance(result, dict) and 'Feasible' in result:
+        return bool(result['Feasible'])
+    if isinstance(result, dict) and ('equilibrium' in result or 'scheil' in result):
+        return all(is_feasible(result[stage], feasiblePhases, liquidPhase)
+                   for stage in ('equilibrium', 'scheil') if stage in result)
+    if isinstance(result, list):
+        if not result:
+            return False
+        for record in result:
+            phases = record.get('Phases', [])
+            if liquidPhase in phases:
+                continue
+            if not phases or not set(phases).issubset(allowed):
+                return False
+        return True
+    if 'finalPhase' in result:
+        phases = result['finalPhase']
+        return bool(phases) and set(phases).issubset(allowed)
+    if 'equilibrium_results' in result:
+        if result.get('error') or not result['equilibrium_results']:
+            return False
+        for record in result['equilibrium_results']:
+            phases = [phase for phase, fraction in record['PhaseFractions'].items() if fraction > 0]
+            if liquidPhase in phases:
+                continue
+            if not phases or not set(phases).issubset(allowed):
+                return False
+        return True
+    phases = result.get('Phases', [])
+    return bool(phases) and liquidPhase not in phases and set(phases).issubset(allowed)
 
 class Task:
-    def __init__(self, config_path):
+    def __init__(self, config_path, graph_cache_dir=None):
+        # Optional on-disk cache of compositional graphs shared between sessions and processes
+        self.graph_cache_dir = graph_cache_dir
+
         # Load YAML configuration
         with open(config_path, 'r') as f:
             self.yaml_content = yaml.safe_load(f)
@@ -54,9 +207,8 @@ class Task:
         # Expand design space components to full master element list dimension
         self._expand_components_to_master()
 
-        # Generate compositional graphs for each design space
+        # Compositional graphs are generated lazily, on first access, and cached here
         self.compositional_graphs_by_design_space = {}
-        self._generate_compositional_graphs()
 
     # Flesh out this.
     def _validate_yaml_content(self):
@@ -205,7 +357,23 @@ class Task:
                 
                 if not isinstance(constraint['startTemperature'], (int, float)):
                     raise ValueError(f"constraints[{i}]['startTemperature'] must be a number")
-            
+
+                if 'adaptive' in constraint and not isinstance(constraint['adaptive'], bool):
+                    raise ValueError(f"constraints[{i}]['adaptive'] must be true or false")
+                if 'tolerance' in constraint and not (isinstance(constraint['tolerance'], (int, float))
+                                                      and 0 < constraint['tolerance'] < 1):
+                    raise ValueError(f"constraints[{i}]['tolerance'] must be a number between 0 and 1")
+                if 'max_step_temperature' in constraint and not (
+                        isinstance(constraint['max_step_temperature'], (int, float))
+                        and constraint['max_step_temperature'] > 0):
+                    raise ValueError(f"constraints[{i}]['max_step_temperature'] must be a positive number")
+
+            elif constraint_type == 'hybrid-scheil':
+                if 'composition_tolerance' in constraint and not (
+                        isinstance(constraint['composition_tolerance'], (int, float))
+                        and 0 <= constraint['composition_tolerance'] < 1):
+                    raise ValueError(f"constraints[{i}]['composition_tolerance'] must be a number between 0 and 1")
+
             elif constraint_type == 'cracking':
                 # Required: criteria
                 if 'criteria' not in constraint:
@@ -239,6 +407,9 @@ class Task:
                         if not isinstance(val, (int, float)):
                             raise ValueError(f"pathPlan[{i}]['composition'][{j}] must be a number")
 
+            if 'penalty' in step and not isinstance(step['penalty'], (int, float)):
+                raise ValueError(f"pathPlan[{i}]['penalty'] must be a number")
+
     def __str__(self):
         """
         String representation of the Task object.
@@ -266,36 +437,118 @@ class Task:
                 expanded_components.append(expanded)
             ds['components_master'] = expanded_components
 
-    def _generate_compositional_graphs(self):
+    def _resolve_design_space_name(self, design_space_name):
+        if design_space_name is None:
+            return next(iter(self.designSpaces_by_name))
+        if design_space_name not in self.designSpaces_by_name:
+            raise ValueError(f"Design space '{design_space_name}' not found in designSpaces")
+        return design_space_name
+
+    def _generate_compositional_graph(self, name):
         ndiv = self.yaml_content.get('nDivisionsPerDimension', 6)
-        for name, ds in self.designSpaces_by_name.items():
-            components_master = ds['components_master']
-            dim = len(components_master)
-            gridAtt, nList = nimplex.simplex_graph_py(dim, ndiv)
-            edges = []
-            for i in range(len(gridAtt)):
-                for n in nList[i]:
-                    edges.append((i, n))
-
-            gridAttTemp, gridElTemp = nimplex.embeddedpair_simplex_grid_fractional_py(components_master, ndiv)
-            self.compositional_graphs_by_design_space[name] = {
-                "edges": edges,
-                "graphN": nList,
-                "compositions": gridElTemp,
-                "gridAtt": gridAtt,
-                "components_master": components_master
-            }
+        components_master = self.designSpaces_by_name[name]['components_master']
+
+        # Content-addressed cache lookup: identical (components_master, ndiv) always give the identical graph
+        if self.graph_cache_dir is not None:
+            key = hashlib.sha256(json.dumps([components_master, ndiv]).encode()).hexdigest()[:16]
+            cachePath = os.path.join(self.graph_cache_dir, f"graph_{key}")
+            if os.path.isdir(cachePath):
+                return CompositionalGraph.load(cachePath)
+
+        dim = len(components_master)
+        gridAtt, nList = nimplex.simplex_graph_py(dim, ndiv)
+        gridAttTemp, gridElTemp = nimplex.embeddedpair_simplex_grid_fractional_py(components_master, ndiv)
+        graph = CompositionalGraph.from_adjacency(nList, gridElTemp, gridAtt, components_master)
+
+        if self.graph_cache_dir is not None:
+            # Write into a private directory and rename it into place, so concurrent processes never see a partial
+            # entry; if another process won the race, its (identical) entry is kept.
+            os.makedirs(self.graph_cache_dir, exist_ok=True)
+            tmpPath = tempfile.mkdtemp(prefix=f"graph_{key}.", dir=self.graph_cache_dir)
+            graph.save(tmpPath)
+            try:
+                os.rename(tmpPath, cachePath)
+            except OSError:
+                shutil.rmtree(tmpPath, ignore_errors=True)
+            if os.path.isdir(cachePath):
+                return CompositionalGraph.load(cachePath)
+        return graph
+
+    def prebuild(self, design_space_names=None):
+        """Eagerly generate (and cache) the compositional graphs of the given design spaces, or of all of them."""
+        if design_space_names is None:
+            design_space_names = list(self.designSpaces_by_name)
+        for name in design_space_names:
+            self.get_compositional_graph(name)
 
     def get_compositional_graph(self, design_space_name=None):
-        if design_space_name is None:
-            design_space_name = list(self.compositional_graphs_by_design_space.keys())[0]
+        """Compositional graph of a design space (the first one by default), generated on first access."""
+        design_space_name = self._resolve_design_space_name(design_space_name)
+        if design_space_name not in self.compositional_graphs_by_design_space:
+            self.compositional_graphs_by_design_space[design_space_name] = \
+                self._generate_compositional_graph(design_space_name)
         return self.compositional_graphs_by_design_space[design_space_name]
 
+    def get_feasible_phases(self, constraint_type='equilibrium'):
+        """Collect the feasiblePhases of all constraints of a given type from the YAML."""
+        feasiblePhases = set()
+        for constraint in self.yaml_content.get('constraints', []):
+            if constraint.get('type', '').lower() == constraint_type and 'feasiblePhases' in constraint:
+                feasiblePhases.update(constraint['feasiblePhases'])
+        return sorted(feasiblePhases)
+
+    def get_path_plan_criterion(self):
+        """Criterion name and penalty factor of the first pathPlan entry with ``criteria`` (penalty defaults to 1), or
+        (None, 1) if the pathPlan does not define one."""
+        for step in self.yaml_content.get('pathPlan', []):
+            if isinstance(step, dict) and 'criteria' in step:
+                return step['criteria'], step.get('penalty', 1)
+        return None, 1
+
+    def get_path_plan_endpoints(self, design_space_name=None):
+        """
+        Graph nodes of the pathPlan entries that belong to a design space (entries naming another designSpace are
+        skipped), in pathPlan order, e.g. the start and end of a path. Entries are located by ``index`` (node index,
+        negative values count from the end), ``position`` (grid coordinates, as in ``gridAtt``), or ``composition``
+        (the nearest node; given either over all master elements or, with ``designSpace``, over the elements of its
+        elemental space).
+
+        Args:
+            design_space_name: Design space to locate the entries in. Defaults to the first one.
+
+        Returns:
+            list: Node indices.
+        """
+        design_space_name = self._resolve_design_space_name(design_space_name)
+        graph = self.get_compositional_graph(design_space_name)
+        elements = self.designSpaces_by_name[design_space_name]['elements']
+        nodes = []
+        for i, step in enumerate(self.yaml_content.get('pathPlan', [])):
+            if step.get('designSpace', design_space_name) != design_space_name:
+                continue
+            if 'index' in step:
+                if not -graph.nNodes <= step['index'] < graph.nNodes:
+                    raise ValueError(f"pathPlan[{i}]['index'] is out of range for {graph.nNodes} nodes")
+                nodes.append(int(step['index']) % graph.nNodes)
+            elif 'position' in step:
+                matches = np.flatnonzero((graph.gridAttArray == np.asarray(step['position'])).all(axis=1))
+                if len(matches) == 0:
+                    raise ValueError(f"pathPlan[{i}]['position'] {step['position']} is not a grid point")
+                nodes.append(int(matches[0]))
+            elif 'composition' in step:
+                composition = step['composition']
+                if len(composition) == len(elements) and 'designSpace' in step:
+                    master = [0.0] * len(self.elementalSpaceComponents)
+                    for el, x in zip(elements, composition):
+                        master[self.elementalSpaceComponents.index(el)] = x
+                    composition = master
+                nodes.append(nearest_node(graph, composition))
+        return nodes
+
     def get_hover_formulas(self, design_space_name=None):
-        if design_space_name is None:
-            design_space_name = list(self.compositional_graphs_by_design_space.keys())[0]
+        design_space_name = self._resolve_design_space_name(design_space_name)
         comp_graph = self.get_compositional_graph(design_space_name)
-        compositions = comp_graph['compositions']
+        compositions = comp_graph.compositionArray
         formulas = []
         for i, comp in enumerate(compositions):
             formula = (f"({i:>3}) " +
@@ -306,22 +559,370 @@ class Task:
         return formulas
 
     def get_projected_grid_df(self, design_space_name=None):
-        if design_space_name is None:
-            design_space_name = list(self.compositional_graphs_by_design_space.keys())[0]
+        design_space_name = self._resolve_design_space_name(design_space_name)
         comp_graph = self.get_compositional_graph(design_space_name)
         gridAtt = comp_graph['gridAtt']
         df = pd.DataFrame(plotting.simplex2cartesian_py(gridAtt), columns=['x', 'y', 'z'])
         return df
 
     def get_pure_component_labels(self, design_space_name=None):
-        if design_space_name is None:
-            design_space_name = list(self.compositional_graphs_by_design_space.keys())[0]
+        design_space_name = self._resolve_design_space_name(design_space_name)
         comp_graph = self.get_compositional_graph(design_space_name)
         dim = len(comp_graph['components_master'])
         ndiv = self.yaml_content.get('nDivisionsPerDimension', 6)
         attainableSpaceComponents = self.designSpaces_by_name[design_space_name]['elements']
         pureComponentIndices = nimplex.pure_component_indexes_py(dim, ndiv)
-        labels = [''] * len(comp_graph['gridAtt'])
+        labels = [''] * comp_graph.nNodes
         for comp, idx in zip(attainableSpaceComponents, pureComponentIndices):
             labels[idx] = "<b>" + comp + "</b>"
-        return labels
\ No newline at end of file
+        return labels
+
+
+def composition_bounds(elements, bounds):
+    """
+    Batch constraint on the amounts of individual elements, for use as a ``ConstraintPipeline`` stage.
+
+    Args:
+        elements: Elements in the order of the composition columns, e.g. ``Task.elementalSpaceComponents``.
+        bounds: Dictionary mapping an element to its ``[min, max]`` fraction. Either end can be None.
+
+    Returns:
+        function: Maps an (n x len(elements)) composition array to a boolean mask of points within all bounds.
+    """
+    limits = []
+    for element, (low, high) in bounds.items():
+        if element not in elements:
+            raise ValueError(f"Element '{element}' of the composition bounds not found in {elements}")
+        limits.append((elements.index(element), -np.inf if low is None else low, np.inf if high is None else high))
+
+    def evaluate(compositions):
+        compositions = np.asarray(compositions, dtype=float)
+        feasible = np.ones(len(compositions), dtype=bool)
+        for idx, low, high in limits:
+            feasible &= (compositions[:, idx] >= low - 1e-9) & (compositions[:, idx] <= high + 1e-9)
+        return feasible
+    return evaluate
+
+
+class ConstraintPipeline:
+    """
+    Evaluates a set of constraints over a compositional grid cheapest-first, so that each stage only sees the points
+    that survived all stages before it. Cheap vectorized constraints (LC density ``run_batch``, ``composition_bounds``)
+    thus prune the whole grid before any equilibrium, Scheil, or cracking calculation runs, and expensive solver calls
+    are never spent on points already known to be infeasible.
+
+    Stages are ordered by their per-point cost, measured on every ``run`` (the ``cost`` given to ``add`` is only the
+    prior used before the first measurement), while always keeping a stage after the stages it ``requires``.
+
+    Example:
+        >>> pipeline = ConstraintPipeline(max_workers=8)
+        >>> pipeline.add('density', LCdensity.run_batch, batch=True)
+        >>> pipeline.add('equilibrium', equilibrium_callable, feasibility=lambda r: is_feasible(r, ['FCC_A1']))
+        >>> pipeline.add('scheil', scheil_callable, feasibility=lambda r: r is not None)
+        >>> pipeline.add('cracking', crackingStage, batch=True, requires=['scheil'])
+        >>> gridFeasible = pipeline.run(graph.compositionArray)
+        >>> print(pipeline.summary())
+
+    Args:
+        executor: A ``CallableExecutor`` to evaluate per-point stages with. If None, one with ``max_workers`` workers,
+            warmed up for all per-point stages, is created for the duration of each ``run``.
+        max_workers: Number of workers of the executor created when ``executor`` is None.
+    """
+    def __init__(self, executor=None, max_workers=4):
+        self.executor = executor
+        self.max_workers = max_workers
+        self.stages = {}
+        self.costs = {}
+        self.outputs = {}
+        self.evaluated = {}
+        self.passed = {}
+        self.feasible = None
+
+    def add(self, name, evaluate, batch=False, requires=(), cost=None, feasibility=None):
+        """
+        Add a constraint stage.
+
+        Args:
+            name: Unique name of the stage.
+            evaluate: For per-point stages, a (generated) callable evaluated at a single composition in the executor.
+                For batch stages, a function evaluated in this process on the array of all surviving compositions,
+                called as ``evaluate(compositions)``, or as ``evaluate(compositions, context)`` if the stage
+                ``requires`` others, where ``context`` maps each required stage name to the list of its outputs for
+                the same compositions (e.g. Scheil results for cracking criteria).
+            batch: Whether ``evaluate`` is a batch function.
+            requires: Names of (previously added) stages that must run before this one.
+            cost: Prior per-point cost in seconds used to order stages before it is measured. Defaults to 1e-6 for
+                batch stages and 1 for per-point stages.
+            feasibility: Maps outputs to feasibility: a single result to True/False for per-point stages (defaults to
+                the result not being None), or the output array to a boolean mask for batch stages (defaults to the
+                output itself being the mask).
+
+        Returns:
+            ConstraintPipeline: The pipeline itself, so calls can be chained.
+        """
+        if name in self.stages:
+            raise ValueError(f"Constraint stage '{name}' already exists")
+        for required in requires:
+            if required not in self.stages:
+                raise ValueError(f"Constraint stage '{name}' requires '{required}', which has to be added first")
+        self.stages[name] = {
+            'evaluate': evaluate,
+            'batch': batch,
+            'requires': tuple(requires),
+            'feasibility': feasibility,
+        }
+        self.costs[name] = cost if cost is not None else (1e-6 if batch else 1.0)
+        return self
+
+    def order(self):
+        """Stage names in evaluation order: repeatedly the cheapest stage whose requirements have already run."""
+        ordered = []
+        remaining = list(self.stages)
+        while remaining:
+            ready = [name for name in remaining if all(r in ordered for r in self.stages[name]['requires'])]
+            name = min(ready, key=lambda n: self.costs[n])
+            ordered.append(name)
+            remaining.remove(name)
+        return ordered
+
+    def summary(self):
+        """One line per stage of the last ``run``: how many of the points it evaluated were feasible, and its cost."""
+        return "\n".join(f"{name}: {self.passed[name]} of {self.evaluated[name]} points feasible "
+                         f"({self.costs[name]:.2e} s/point)" for name in self.passed)
+
+    def run(self, compositions, mask=None, progress=True, verbose=False):
+        """
+        Evaluate all stages over a compositional grid.
+
+        Args:
+            compositions: Array (or list) of compositions, e.g. ``CompositionalGraph.compositionArray``.
+            mask: Optional boolean array of points to consider at all. Others are treated as infeasible.
+            progress: Whether to show progress bars for per-point stages.
+            verbose: Whether to print the ``summary`` line of each stage once it is done.
+
+        Returns:
+            np.ndarray: Boolean mask of points feasible under all constraints. Outputs of every stage are kept in
+            ``outputs`` (None for points a stage never evaluated), and the number of points each stage evaluated and
+            found feasible in ``evaluated`` and ``passed``.
+        """
+        compositions = np.asarray(compositions, dtype=float)
+        nPoints = len(compositions)
+        alive = np.ones(nPoints, dtype=bool) if mask is None else np.array(mask, dtype=bool)
+        self.outputs = {name: [None] * nPoints for name in self.stages}
+        self.evaluated = {}
+        self.passed = {}
+
+        order = self.order()
+        perPointCallables = [self.stages[name]['evaluate'] for name in order if not self.stages[name]['batch']]
+        executor = self.executor
+        if executor is None and perPointCallables:
+            executor = CallableExecutor(perPointCallables, max_workers=self.max_workers)
+        try:
+            for name in order:
+                stage = self.stages[name]
+                nodes = np.flatnonzero(alive)
+                self.evaluated[name] = len(nodes)
+                if len(nodes) == 0:
+                    continue
+
+                start = time.perf_counter()
+                if stage['batch']:
+                    args = (compositions[nodes],)
+                    if stage['requires']:
+                        args += ({r: [self.outputs[r][i] for i in nodes] for r in stage['requires']},)
+                    outputs = stage['evaluate'](*args)
+                    passed = outputs if stage['feasibility'] is None else stage['feasibility'](outputs)
+                    passed = np.asarray(passed, dtype=bool)
+                else:
+                    outputs = executor.map(stage['evaluate'], compositions[nodes].tolist(), progress=progress)
+                    feasibility = stage['feasibility'] or (lambda result: result is not None)
+                    passed = np.array([bool(feasibility(result)) for result in outputs], dtype=bool)
+                self.costs[name] = (time.perf_counter() - start) / len(nodes)
+
+                for node, output in zip(nodes.tolist(), list(outputs)):
+                    self.outputs[name][node] = output
+                alive[nodes[~passed]] = False
+                self.passed[name] = int(passed.sum())
+                if verbose:
+                    print(self.summary().splitlines()[-1])
+        finally:
+            if self.executor is None and executor is not None:
+                executor.shutdown()
+
+        self.feasible = alive
+        return alive
+
+
+class Explorer:
+    """
+    Frontier-streaming exploration of the feasible region of a design space's compositional graph. Instead of
+    evaluating the graph in BFS waves, where one slow point stalls the whole wave, every node is submitted as a
+    future and the neighbors of a feasible node are submitted the moment its result arrives, keeping all workers busy.
+
+    Any generated callable (equilibrium, Scheil, or hybrid) can be explored; feasibility of its results is decided by
+    ``feasibility`` (defaults to ``is_feasible`` with the equilibrium feasiblePhases from the YAML).
+
+    Args:
+        task: The ``Task`` holding the compositional graphs.
+        callable_func: Generated callable evaluated at each composition.
+        design_space_name: Design space to explore. Defaults to the first one.
+        feasibility: Function mapping a callable result to True/False.
+        executor: A ``CallableExecutor`` to reuse across explorations. If None, one with ``max_workers`` workers is
+            created for the duration of each ``run``.
+        max_workers: Number of workers of the executor created when ``executor`` is None.
+        report_every: Seconds between progress/throughput reports. None disables them.
+        checkpoint: Path prefix of an ``ExplorationCheckpoint``. Every completed node is appended to it, and an
+            existing checkpoint is resumed from its exact frontier.
+        seeded: Warm-start every calculation from an already solved neighbor, by passing the result of the node it
+            was reached from (or of any feasible explored neighbor) as ``seed`` to the callable, which has to support
+            it (e.g. the generated ``equilibrium_callable``). Starting nodes without such a neighbor get ``seed=[]``.
+    """
+    def __init__(self, task, callable_func, design_space_name=None, feasibility=None, executor=None, max_workers=4,
+                 report_every=10, checkpoint=None, seeded=False):
+        self.task = task
+        self.callable_func = callable_func
+        self.design_space_name = design_space_name
+        if feasibility is None:
+            feasiblePhases = task.get_feasible_phases()
+            feasibility = lambda result: is_feasible(result, feasiblePhases)
+        self.feasibility = feasibility
+        self.executor = executor
+        self.max_workers = max_workers
+        self.report_every = report_every
+        self.seeded = seeded
+
+        graph = task.get_compositional_graph(design_space_name)
+        self.graph = graph
+        self.results = [None] * graph.nNodes
+        self.gridFeasible = [None] * graph.nNodes
+        self.explored = set()
+        self.calcCount = 0
+        self.throughput = 0.0
+
+        self.checkpoint = None
+        if checkpoint is not None:
+            self.checkpoint = ExplorationCheckpoint(checkpoint, graph.nNodes)
+            for node, feasible, result in self.checkpoint.iter_results():
+                self.results[node] = result
+                self.gridFeasible[node] = feasible
+                self.explored.add(node)
+                self.calcCount += 1
+            if self.calcCount:
+                print(f"Resuming from checkpoint: {self.calcCount} explored")
+
+    def _submit(self, executor, pending, node, parent=None):
+        self.explored.add(node)
+        composition = self.graph.compositionArray[node].tolist()
+        if not self.seeded:
+            pending[executor.submit(self.callable_func, composition)] = node
+            return
+        if parent is None:
+            # E.g. starting nodes or a resumed frontier: seed from any feasible neighbor solved earlier
+            parent = next((n for n in self.graph.neighbors(node).tolist() if self.gridFeasible[n]), None)
+        seed = [] if parent is None else self.results[parent]
+        pending[executor.submit(self.callable_func, composition, seed=seed)] = node
+
+    def _record(self, node, result):
+        """Store the result of a completed node and return its feasibility."""
+        feasible = self.feasibility(result)
+        self.results[node] = result
+        self.gridFeasible[node] = feasible
+        self.calcCount += 1
+        if self.checkpoint is not None:
+            self.checkpoint.append(node, feasible, result)
+        return feasible
+
+    def _report(self, pending):
+        print(f"Calculations done: {self.calcCount:<5} | Explored points: {len(self.explored):<5} | "
+              f"In flight: {len(pending):<4} | {self.throughput:.2f} points/sec")
+
+    def run(self, startingNodes=None):
+        """
+        Explore the feasible region connected to ``startingNodes`` (defaults to node 0). Can be called again with new
+        starting nodes; already explored nodes are not recomputed. With a checkpoint, the frontier left by an
+        interrupted run is resumed as well.
+
+        Returns:
+            list: Feasibility of each node (True/False, or None if never explored).
+        """
+        if startingNodes is None:
+            startingNodes = [0]
+        executor = self.executor or CallableExecutor([self.callable_func], max_workers=self.max_workers)
+        pending = {}
+        start = time.perf_counter()
+        lastReport = start
+        calcCountStart = self.calcCount
+        try:
+            if self.checkpoint is not None:
+                self.checkpoint.add_seeds(startingNodes)
+                startingNodes = self.checkpoint.frontier(self.graph) + list(startingNodes)
+            for node in startingNodes:
+                if node not in self.explored:
+                    self._submit(executor, pending, node)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = pending.pop(future)
+                    feasible = self._record(node, future.result())
+                    # Expand to neighbors of the point right away (only if the node has been feasible)
+                    if feasible:
+                        for n in self.graph.neighbors(node).tolist():
+                            if n not in self.explored:
+                                self._submit(executor, pending, n, parent=node)
+
+                now = time.perf_counter()
+                self.throughput = (self.calcCount - calcCountStart) / max(now - start, 1e-9)
+                if self.report_every is not None and now - lastReport >= self.report_every:
+                    self._report(pending)
+                    lastReport = now
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+        if self.report_every is not None:
+            self._report(pending)
+        return self.gridFeasible
+
+    def find_path(self, source=None, target=None, weights=None, batch=None):
+        """
+        Goal-directed path search that evaluates the callable only at nodes the search needs (see
+        ``ammap.pathplanning.lazy_astar``), instead of exploring the whole feasible region first. Results are stored
+        like in ``run`` (and in the checkpoint), and nodes explored earlier are not recomputed.
+
+        Args:
+            source: Starting node. Defaults to the first pathPlan entry of the design space.
+            target: Ending node. Defaults to the last pathPlan entry of the design space.
+            weights: Optional non-negative weight of every edge, aligned with ``graph.indices``. Defaults to 1.
+            batch: Number of nodes evaluated in parallel per step. Defaults to the number of workers.
+
+        Returns:
+            tuple: Path as a list of node indices (empty if no feasible path exists) and its cost.
+        """
+        if source is None or target is None:
+            endpoints = self.task.get_path_plan_endpoints(self.design_space_name)
+            if len(endpoints) < 2:
+                raise ValueError("pathPlan needs at least two entries in this design space to define a path")
+            source = endpoints[0] if source is None else source
+            target = endpoints[-1] if target is None else target
+        executor = self.executor or CallableExecutor([self.callable_func], max_workers=self.max_workers)
+        if batch is None:
+            batch = executor.max_workers
+
+        def evaluate(nodes):
+            pending = {}
+            for node in nodes:
+                self._submit(executor, pending, node)
+            for future, node in pending.items():
+                self._record(node, future.result())
+            return [self.gridFeasible[node] for node in nodes]
+
+        try:
+            path, cost, evaluated = lazy_astar(self.graph, source, target, evaluate, self.gridFeasible, weights, batch)
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+        if self.report_every is not None:
+            print(f"Path of {len(path)} nodes found after evaluating {len(evaluated)} of {self.graph.nNodes} points"
+                  if path else f"No feasible path after evaluating {len(evaluated)} of {self.graph.nNodes} points")
+        return path, cost
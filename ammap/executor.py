@@ -0,0 +1,106 @@
+"""Long-lived process pool for evaluating generated AMMap callables (equilibrium, Scheil, hybrid) over many waves of
+compositional graph exploration.
+
+Generated callable modules parse their TDB file and build ``phase_records`` when imported, so spinning up a fresh pool
+for every BFS wave (e.g. with ``tqdm.contrib.concurrent.process_map``) pays that cost over and over. The
+``CallableExecutor`` below keeps its workers alive between waves and warms every worker up once, at start, for every
+elemental space it will be asked to evaluate.
+"""
+import importlib
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from tqdm import tqdm
+
+
+def load_callables(package, prefix, attribute):
+    """Imports every generated module in a callables package whose name starts with ``prefix`` and collects the
+    requested callable from each of them.
+
+    Args:
+        package: Dotted name of the package holding generated callables, e.g. ``ammap.callables.CoNiCrFe2``.
+        prefix: Module name prefix to select, e.g. ``equilibrium``, ``scheil``, or ``hybrid``.
+        attribute: Name of the callable inside each module, e.g. ``equilibrium_callable``.
+
+    Returns:
+        dict: Module name (without the package) mapped to the callable.
+    """
+    directory = os.path.dirname(importlib.import_module(package).__file__)
+    callables = {}
+    for file in sorted(os.listdir(directory)):
+        if file.startswith(prefix) and file.endswith('.py'):
+            module = importlib.import_module(f"{package}.{file[:-3]}")
+            callables[file[:-3]] = getattr(module, attribute)
+    return callables
+
+
+def _warm_up(module_paths):
+    """Worker initializer importing every callable module once, which loads the database, instantiates the models and
+    builds the phase records in this worker process."""
+    for module_path in module_paths:
+        module = importlib.import_module(module_path)
+        # Templates with lazy initialization keep their pycalphad objects in a module-level cache
+        if hasattr(module, '_initialize_thermo_objects') and not module._thermo_cache:
+            module._initialize_thermo_objects()
+
+
+def _call_safely(func, elP, kwargs):
+    try:
+        return func(elP, **kwargs)
+    except Exception as e:
+        print(f"Error processing composition {elP}: {str(e)}")
+        return None
+
+
+class CallableExecutor:
+    """Persistent pool of worker processes, each holding warmed-up thermodynamic objects for all callables it was
+    created with. New waves of compositions can be submitted at any time without re-spawning workers.
+
+    Args:
+        callables: Iterable (or dict) of generated callables, e.g. the values returned by ``load_callables``. Their
+            modules are imported in every worker at start-up.
+        max_workers: Number of worker processes. Defaults to 4, like the exploration notebooks.
+    """
+    def __init__(self, callables, max_workers=4):
+        if isinstance(callables, dict):
+            callables = callables.values()
+        # Wrappers (e.g. ammap.store.StoredCallable) are unwrapped to the generated callable they call. Callables
+        # defined interactively (in __main__) cannot be imported by module path, so they are not warmed up.
+        modules = {inspect.unwrap(func).__module__ for func in callables}
+        self.module_paths = sorted(m for m in modules if m != '__main__')
+        self.max_workers = max_workers
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_warm_up,
+            initargs=(self.module_paths,))
+
+    def submit(self, func, elP, **kwargs):
+        """Schedules a single composition and returns a ``concurrent.futures.Future`` resolving to the callable result,
+        or to None if the callable raised."""
+        return self._pool.submit(_call_safely, func, elP, kwargs)
+
+    def map(self, func, elPositions, progress=True, **kwargs):
+        """Evaluates a whole wave of compositions with one callable and returns the results in input order.
+
+        Args:
+            func: Generated callable to apply, e.g. ``equilibrium_callable``.
+            elPositions: List of compositions.
+            progress: Whether to show a ``tqdm`` progress bar.
+            **kwargs: Extra keyword arguments passed to every call.
+
+        Returns:
+            list: Callable results, with None for compositions that raised.
+        """
+        futures = [self.submit(func, elP, **kwargs) for elP in elPositions]
+        return [f.result() for f in tqdm(futures, disable=not progress)]
+
+    def shutdown(self, wait=True):
+        """Stops all worker processes."""
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
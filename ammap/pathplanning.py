@@ -0,0 +1,546 @@
+"""Shortest path planning directly over the CSR adjacency of a ``CompositionalGraph``.
+
+Edge weights are a float array aligned with the graph's ``indices`` (one weight per directed edge, infinity for
+blocked edges) and node feasibility is a boolean mask, so restricting planning to the feasible region is a single
+array filter instead of rebuilding edge lists for an object-per-node graph (as with the ``pathfinding`` package).
+Searches use a binary heap (``heapq``) and only read the CSR rows of the nodes they expand.
+
+Every graph edge moves between neighboring grid points, so the composition (L1) distance covered by one edge is
+bounded by the longest edge of the graph. ``astar`` uses that bound, together with the smallest edge weight, as an
+admissible and consistent heuristic: it returns the same shortest paths as ``dijkstra`` while expanding far fewer
+nodes.
+"""
+import math
+import heapq
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+
+
+def node_mask(feasible, nNodes):
+    """Boolean mask of nodes that may be traversed.
+
+    Args:
+        feasible: None (all nodes allowed), or one entry per node such as ``gridFeasible``; None entries (not
+            evaluated) count as infeasible.
+        nNodes: Number of graph nodes.
+
+    Returns:
+        np.ndarray: Boolean array of length ``nNodes``.
+    """
+    if feasible is None:
+        return np.ones(nNodes, dtype=bool)
+    mask = np.asarray(feasible)
+    if mask.dtype != bool:
+        mask = np.array([bool(f) for f in feasible], dtype=bool)
+    if len(mask) != nNodes:
+        raise ValueError(f"Feasibility has {len(mask)} entries but the graph has {nNodes} nodes")
+    return mask
+
+
+def edge_weights(graph, feasible=None, weights=None):
+    """Per-edge weights with edges touching infeasible nodes blocked (set to infinity).
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        feasible: Node feasibility, see ``node_mask``.
+        weights: Optional non-negative weight of every edge, aligned with ``graph.indices``. Defaults to 1.
+
+    Returns:
+        np.ndarray: Float array of length ``graph.nEdges``.
+    """
+    mask = node_mask(feasible, graph.nNodes)
+    if weights is None:
+        weights = np.ones(graph.nEdges)
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (graph.nEdges,):
+        raise ValueError(f"Expected {graph.nEdges} edge weights, got array of shape {weights.shape}")
+    if np.any(weights < 0):
+        raise ValueError("Edge weights must be non-negative")
+    return np.where(mask[graph.edge_sources()] & mask[graph.indices], weights, np.inf)
+
+
+def astar_heuristic(graph, target, weights):
+    """Admissible and consistent A* heuristic towards ``target``: the L1 composition distance to the target, divided
+    by the largest L1 distance spanned by a single edge (``graph.max_edge_length()``) and multiplied by the smallest
+    edge weight.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        target: Target node.
+        weights: Per-edge weights from ``edge_weights``.
+
+    Returns:
+        np.ndarray: Lower bound on the remaining path cost for every node.
+    """
+    open_edges = weights[np.isfinite(weights)]
+    step = graph.max_edge_length()
+    if len(open_edges) == 0 or step <= 0:
+        return np.zeros(graph.nNodes)
+    distance = np.abs(graph.compositionArray - graph.compositionArray[target]).sum(axis=1)
+    return distance / step * open_edges.min()
+
+
+def _search(graph, source, target, weights, heuristic=None, excluded=(), indptr=None):
+    """Heap-based best-first search from ``source`` to ``target`` over per-edge ``weights`` (Dijkstra when
+    ``heuristic`` is None, A* otherwise), never passing through the ``excluded`` nodes. Repeated searches on the same
+    graph can pass ``indptr`` and ``heuristic`` already converted to lists.
+
+    Returns:
+        tuple: Path as a list of node indices (empty if ``target`` is unreachable), its cost, and the number of
+        expanded nodes.
+    """
+    if not 0 <= source < graph.nNodes or not 0 <= target < graph.nNodes:
+        raise ValueError(f"Source and target must be nodes of the graph (0 to {graph.nNodes - 1})")
+    indptr = graph.indptr.tolist() if indptr is None else indptr
+    indices = graph.indices
+    if heuristic is None:
+        h = [0.0] * graph.nNodes
+    else:
+        h = heuristic if isinstance(heuristic, list) else heuristic.tolist()
+
+    inf = math.inf
+    # Dictionaries keep the set-up cost proportional to the explored part of the graph
+    dist = {source: 0.0}
+    prev = {}
+    closed = set(excluded)
+    # Ties in estimated total cost are broken towards the node closest to the target
+    heap = [(h[source], h[source], source)]
+    expanded = 0
+    while heap:
+        _, _, u = heapq.heappop(heap)
+        if u in closed:
+            continue
+        if u == target:
+            break
+        closed.add(u)
+        expanded += 1
+        du = dist[u]
+        # Only the rows of expanded nodes are converted, which A* keeps to a small part of the graph
+        start, end = indptr[u], indptr[u + 1]
+        for v, w in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+            if w == inf:
+                continue
+            d = du + w
+            if d < dist.get(v, inf):
+                dist[v] = d
+                prev[v] = u
+                heapq.heappush(heap, (d + h[v], h[v], v))
+
+    if target not in dist:
+        return [], inf, expanded
+    path = [target]
+    while path[-1] != source:
+        path.append(prev[path[-1]])
+    return path[::-1], dist[target], expanded
+
+
+def dijkstra(graph, source, target, feasible=None, weights=None):
+    """Shortest path between two nodes with Dijkstra's algorithm.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        source: Starting node.
+        target: Ending node.
+        feasible: Node feasibility (e.g. ``gridFeasible``); infeasible nodes are never traversed.
+        weights: Optional non-negative weight of every edge, aligned with ``graph.indices``. Defaults to 1, i.e. the
+            path with the fewest steps.
+
+    Returns:
+        tuple: Path as a list of node indices (empty if no feasible path exists) and its cost (infinity if none).
+    """
+    path, cost, _ = _search(graph, source, target, edge_weights(graph, feasible, weights))
+    return path, cost
+
+
+def astar(graph, source, target, feasible=None, weights=None):
+    """Shortest path between two nodes with A*, guided by the composition distance to ``target`` (see
+    ``astar_heuristic``). Takes the same arguments and returns the same optimal cost as ``dijkstra``."""
+    weights = edge_weights(graph, feasible, weights)
+    path, cost, _ = _search(graph, source, target, weights, astar_heuristic(graph, target, weights))
+    return path, cost
+
+
+def nearest_node(graph, composition, feasible=None):
+    """Node whose composition is closest (L1 distance) to ``composition``, e.g. to locate the start or end of a path.
+
+    Args:
+        graph: ``CompositionalGraph`` to search.
+        composition: Composition in the order of ``graph.components_master``.
+        feasible: Optional node feasibility; only feasible nodes are considered.
+
+    Returns:
+        int: Node index, or None if no node is feasible.
+    """
+    composition = np.asarray(composition, dtype=float)
+    if composition.shape != (graph.compositionArray.shape[1],):
+        raise ValueError(f"Composition must have {graph.compositionArray.shape[1]} entries, one per element of "
+                         f"{graph.components_master}")
+    distance = np.abs(graph.compositionArray - composition).sum(axis=1)
+    distance[~node_mask(feasible, graph.nNodes)] = np.inf
+    if not np.isfinite(distance).any():
+        return None
+    return int(np.argmin(distance))
+
+
+def gradient_edge_weights(graph, criterion, penalty=1, feasible=None):
+    """Edge weights favoring paths along which a criterion (e.g. a cracking criterion from
+    ``ammap.callables.cracking``) decreases, computed for all edges at once. As in the path planning notebooks, the
+    edge from node ``i`` to node ``j`` weighs ``1 - round((criterion[i] - criterion[j]) * penalty, 3)``, and all
+    weights are shifted up by the most negative one so that they are non-negative.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        criterion: Criterion value of every node; None or NaN where it is undefined.
+        penalty: Penalty factor of the criterion gradient, e.g. the ``penalty`` of the pathPlan criteria entry.
+        feasible: Node feasibility, see ``node_mask``.
+
+    Returns:
+        np.ndarray: Weight of every edge, aligned with ``graph.indices``. Edges touching infeasible nodes or nodes
+        without a criterion value are blocked (infinity).
+    """
+    criterion = np.asarray(criterion)
+    if criterion.dtype == object:
+        criterion = np.array([np.nan if c is None else c for c in criterion], dtype=float)
+    criterion = criterion.astype(float)
+    if criterion.shape != (graph.nNodes,):
+        raise ValueError(f"Criterion has {len(criterion)} entries but the graph has {graph.nNodes} nodes")
+    mask = node_mask(feasible, graph.nNodes) & np.isfinite(criterion)
+    sources = graph.edge_sources()
+    weights = 1 - np.round((criterion[sources] - criterion[graph.indices]) * penalty, 3)
+    weights = np.where(mask[sources] & mask[graph.indices], weights, np.inf)
+    open_edges = np.isfinite(weights)
+    if open_edges.any():
+        lowest = weights[open_edges].min()
+        if lowest < 0:
+            weights[open_edges] -= lowest
+    return weights
+
+
+def lower_bounds(graph, target, weights):
+    """Exact cost of the cheapest path from every node to ``target`` (infinity where none exists), from a single
+    reverse Dijkstra over the open edges.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        target: Target node.
+        weights: Per-edge weights from ``edge_weights``.
+
+    Returns:
+        np.ndarray: Remaining cost for every node.
+    """
+    open_edges = np.isfinite(weights)
+    reverse = csr_matrix((weights[open_edges], (graph.indices[open_edges], graph.edge_sources()[open_edges])),
+                         shape=(graph.nNodes, graph.nNodes))
+    return csgraph_dijkstra(reverse, indices=target)
+
+
+def _dominates(a, b, tolerance=1e-9):
+    """Whether cost vector ``a`` is at most ``b`` in every criterion (i.e. ``b`` is dominated or equal), up to a
+    ``tolerance`` absorbing rounding differences between sums of the same weights in different orders."""
+    for x, y in zip(a, b):
+        if x > y + tolerance:
+            return False
+    return True
+
+
+def pareto_paths(graph, source, target, costs, feasible=None, max_labels=None):
+    """Non-dominated (Pareto-optimal) paths between two nodes under several criteria at once, e.g. path length and
+    the gradient weights of several cracking criteria, with a multi-objective label-setting search.
+
+    Labels (partial paths with their cost vectors) are expanded in order of the summed lower bound of their total
+    cost, where the lower bound of every criterion is the exact remaining cost to ``target`` from ``lower_bounds``;
+    expanded labels are thus never dominated later. A label is discarded when another label at the same node
+    dominates it, or when its lower bound is already dominated by a path found to ``target``.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        source: Starting node.
+        target: Ending node.
+        costs: List of per-edge cost arrays aligned with ``graph.indices`` (e.g. from ``gradient_edge_weights``); None
+            entries stand for unit costs (path length).
+        feasible: Node feasibility, see ``node_mask``.
+        max_labels: Optional cap on the number of labels expanded per node. Bounds the work on large grids, at the
+            price of possibly missing some Pareto-optimal paths.
+
+    Returns:
+        list: ``(path, cost)`` tuples of node index lists and cost tuples (one entry per criterion), one for every
+        distinct non-dominated cost, sorted by cost.
+    """
+    if not 0 <= source < graph.nNodes or not 0 <= target < graph.nNodes:
+        raise ValueError(f"Source and target must be nodes of the graph (0 to {graph.nNodes - 1})")
+    if not costs:
+        raise ValueError("At least one cost array is needed")
+    weights = np.stack([edge_weights(graph, feasible, c) for c in costs], axis=1)
+    # An edge is usable only if it is open in every criterion
+    weights[~np.isfinite(weights).all(axis=1)] = np.inf
+    bounds = np.stack([lower_bounds(graph, target, weights[:, k]) for k in range(len(costs))], axis=1)
+    if not np.isfinite(bounds[source]).all():
+        return []
+
+    indptr = graph.indptr.tolist()
+    reachable = np.isfinite(bounds).all(axis=1).tolist()
+    bounds = bounds.tolist()
+    labelCost, labelNode, labelParent = [(0.0,) * len(costs)], [source], [-1]
+    settled = {}
+    found = []
+    heap = [(sum(bounds[source]), 0)]
+    while heap:
+        _, label = heapq.heappop(heap)
+        cost, u = labelCost[label], labelNode[label]
+        expanded = settled.setdefault(u, [])
+        if any(_dominates(other, cost) for other in expanded):
+            continue
+        estimate = [c + b for c, b in zip(cost, bounds[u])]
+        if any(_dominates(labelCost[other], estimate) for other in found):
+            continue
+        if max_labels is not None and len(expanded) >= max_labels:
+            continue
+        expanded.append(cost)
+        if u == target:
+            found.append(label)
+            continue
+        start, end = indptr[u], indptr[u + 1]
+        for v, w in zip(graph.indices[start:end].tolist(), weights[start:end].tolist()):
+            if not reachable[v] or w[0] == math.inf:
+                continue
+            newCost = tuple(c + x for c, x in zip(cost, w))
+            if any(_dominates(other, newCost) for other in settled.get(v, ())):
+                continue
+            labelCost.append(newCost)
+            labelNode.append(v)
+            labelParent.append(label)
+            heapq.heappush(heap, (sum(newCost) + sum(bounds[v]), len(labelCost) - 1))
+
+    paths = []
+    for label in found:
+        cost, path = labelCost[label], []
+        while label != -1:
+            path.append(labelNode[label])
+            label = labelParent[label]
+        paths.append((path[::-1], cost))
+    return sorted(paths, key=lambda item: item[1])
+
+
+def _edge_index(graph, u, v):
+    """Position of the edge from ``u`` to ``v`` in ``graph.indices``."""
+    return int(graph.indptr[u] + np.flatnonzero(graph.neighbors(u) == v)[0])
+
+
+class KShortestPaths:
+    """
+    Ranked alternative paths between two nodes, shortest first, with Yen's algorithm over the feasible subgraph of a
+    ``CompositionalGraph`` (the CSR form of the Task's ``graphN``). Paths are computed incrementally: asking for more
+    paths continues from the state left by the previous ones instead of recomputing them. Spur paths are found with
+    A* (see ``astar_heuristic``), with blocked edges set to infinity in place for the duration of a single search.
+
+    Iterating over the object yields ``(path, cost)`` tuples until no further path exists.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        source: Starting node.
+        target: Ending node.
+        feasible: Node feasibility (e.g. ``gridFeasible``); infeasible nodes are never traversed.
+        weights: Optional non-negative weight of every edge, aligned with ``graph.indices``. Defaults to 1.
+        min_difference: Minimum number of nodes of a returned path that are not on any previously returned path.
+            Paths too similar to those already returned are skipped; the first (shortest) path is always returned.
+            Defaults to 0 (plain K shortest paths).
+        max_rejections: Maximum number of consecutive paths skipped as too similar before the search gives up, so a
+            strict ``min_difference`` cannot make it enumerate every path of the graph. Defaults to 1000.
+    """
+    def __init__(self, graph, source, target, feasible=None, weights=None, min_difference=0, max_rejections=1000):
+        if not 0 <= source < graph.nNodes or not 0 <= target < graph.nNodes:
+            raise ValueError(f"Source and target must be nodes of the graph (0 to {graph.nNodes - 1})")
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.min_difference = min_difference
+        self.max_rejections = max_rejections
+        self.weights = edge_weights(graph, feasible, weights)
+        self._heuristic = astar_heuristic(graph, target, self.weights).tolist()
+        self._indptr = graph.indptr.tolist()
+        self.paths = []
+        # Union of the nodes of all returned paths
+        self._covered = set()
+        # All paths found by Yen's algorithm, including those skipped for being too similar
+        self._shortest = []
+        self._candidates = []
+        self._seen = set()
+        self._exhausted = False
+
+    def _path_cost(self, path):
+        return float(sum(self.weights[_edge_index(self.graph, u, v)] for u, v in zip(path, path[1:])))
+
+    def _next_shortest(self):
+        """Next path of Yen's algorithm, or None when all paths have been found."""
+        if not self._shortest:
+            path, cost, _ = _search(self.graph, self.source, self.target, self.weights, self._heuristic,
+                                    indptr=self._indptr)
+            if not path:
+                return None
+            self._seen.add(tuple(path))
+            self._shortest.append((path, cost))
+            return path, cost
+
+        previous, _ = self._shortest[-1]
+        for i in range(len(previous) - 1):
+            root = previous[:i + 1]
+            # Edges leaving the spur node along already found paths with the same root are blocked
+            blocked = {_edge_index(self.graph, root[-1], path[i + 1]) for path, _ in self._shortest
+                       if len(path) > i + 1 and path[:i + 1] == root}
+            saved = {e: self.weights[e] for e in blocked}
+            self.weights[list(blocked)] = np.inf
+            try:
+                spur, spurCost, _ = _search(self.graph, root[-1], self.target, self.weights, self._heuristic,
+                                            excluded=root[:-1], indptr=self._indptr)
+            finally:
+                for e, w in saved.items():
+                    self.weights[e] = w
+            if spur:
+                path = root[:-1] + spur
+                if tuple(path) not in self._seen:
+                    self._seen.add(tuple(path))
+                    heapq.heappush(self._candidates, (self._path_cost(root) + spurCost, path))
+        if not self._candidates:
+            return None
+        cost, path = heapq.heappop(self._candidates)
+        self._shortest.append((path, cost))
+        return path, cost
+
+    def __iter__(self):
+        for item in self.paths:
+            yield item
+        while True:
+            item = self.next()
+            if item is None:
+                return
+            yield item
+
+    def next(self):
+        """Computes the next path.
+
+        Returns:
+            tuple: ``(path, cost)``, or None if no further (sufficiently different) path exists, or none was found
+            within ``max_rejections`` consecutive skipped paths.
+        """
+        rejections = 0
+        while not self._exhausted:
+            item = self._next_shortest()
+            if item is None:
+                break
+            path, _ = item
+            if not self.paths or len(set(path) - self._covered) >= self.min_difference:
+                self.paths.append(item)
+                self._covered.update(path)
+                return item
+            rejections += 1
+            if rejections >= self.max_rejections:
+                break
+        self._exhausted = True
+        return None
+
+    def get(self, k):
+        """The ``k`` shortest paths (fewer if fewer exist), computing only those not found yet.
+
+        Returns:
+            list: ``(path, cost)`` tuples, shortest first.
+        """
+        while len(self.paths) < k and self.next() is not None:
+            pass
+        return self.paths[:k]
+
+
+def lazy_astar(graph, source, target, evaluate, feasible=None, weights=None, batch=1):
+    """Goal-directed A* that learns node feasibility only when it needs it, instead of requiring a full feasibility
+    map: edges are relaxed optimistically, and a node is evaluated when it reaches the top of the open list, i.e. when
+    the search is about to expand it. Infeasible nodes are then dropped, so the returned path is the shortest one
+    through feasible nodes, found after evaluating only nodes whose estimated total cost is below the path cost.
+
+    Args:
+        graph: ``CompositionalGraph`` to plan on.
+        source: Starting node.
+        target: Ending node.
+        evaluate: Function mapping a list of node indices to their feasibility (a list of True/False), e.g. running
+            the generated callables on the nodes' compositions.
+        feasible: Known feasibility with one entry per node (True/False, or None if unknown), e.g. ``gridFeasible``
+            of an earlier exploration. Updated in place with every evaluated node, so it caches results across
+            searches. Defaults to all nodes unknown.
+        weights: Optional non-negative weight of every edge, aligned with ``graph.indices``. Defaults to 1.
+        batch: Number of unknown nodes evaluated at once: the node about to be expanded together with the next most
+            promising unknown nodes on the open list, e.g. to keep several workers busy. With 1, only nodes the
+            search expands are evaluated.
+
+    Returns:
+        tuple: Path as a list of node indices (empty if no feasible path exists), its cost (infinity if none), and
+        the list of nodes evaluated during the search.
+    """
+    if not 0 <= source < graph.nNodes or not 0 <= target < graph.nNodes:
+        raise ValueError(f"Source and target must be nodes of the graph (0 to {graph.nNodes - 1})")
+    if feasible is None:
+        feasible = [None] * graph.nNodes
+    elif len(feasible) != graph.nNodes:
+        raise ValueError(f"Feasibility has {len(feasible)} entries but the graph has {graph.nNodes} nodes")
+    weights = edge_weights(graph, None, weights)
+    h = astar_heuristic(graph, target, weights).tolist()
+    indptr = graph.indptr.tolist()
+    evaluated = []
+
+    def learn(nodes):
+        for node, value in zip(nodes, evaluate(nodes)):
+            feasible[node] = bool(value)
+            evaluated.append(node)
+
+    endpoints = [node for node in dict.fromkeys((source, target)) if feasible[node] is None]
+    if endpoints:
+        learn(endpoints)
+    if not feasible[source] or not feasible[target]:
+        return [], math.inf, evaluated
+
+    inf = math.inf
+    dist = {source: 0.0}
+    prev = {}
+    closed = set()
+    heap = [(h[source], h[source], source)]
+    found = False
+    while heap:
+        entry = heapq.heappop(heap)
+        u = entry[2]
+        if u in closed:
+            continue
+        if feasible[u] is None:
+            # Evaluate this node together with the next most promising unknown ones, then resume
+            entries, nodes = [entry], [u]
+            while len(nodes) < batch and heap:
+                entries.append(heapq.heappop(heap))
+                v = entries[-1][2]
+                if v not in closed and feasible[v] is None and v not in nodes:
+                    nodes.append(v)
+            learn(nodes)
+            for item in entries:
+                heapq.heappush(heap, item)
+            continue
+        if not feasible[u]:
+            closed.add(u)
+            continue
+        if u == target:
+            found = True
+            break
+        closed.add(u)
+        du = dist[u]
+        start, end = indptr[u], indptr[u + 1]
+        for v, w in zip(graph.indices[start:end].tolist(), weights[start:end].tolist()):
+            if w == inf or (feasible[v] is not None and not feasible[v]):
+                continue
+            d = du + w
+            if d < dist.get(v, inf):
+                dist[v] = d
+                prev[v] = u
+                heapq.heappush(heap, (d + h[v], h[v], v))
+
+    if not found:
+        return [], inf, evaluated
+    path = [target]
+    while path[-1] != source:
+        path.append(prev[path[-1]])
+    return path[::-1], dist[target], evaluated
@@ -0,0 +1,135 @@
+"""Persistent, content-addressed store of callable results backed by a local SQLite database.
+
+Every result is keyed by the hash of the thermodynamic database file, the (sorted) elements of the elemental space,
+the constraint parameters the callable was generated with, and the rounded composition. Writes are append-only
+(a key is written once and never rewritten), so the store can be shared by many worker processes and by repeated or
+overlapping runs, e.g. overlapping design spaces in path planning, which then never recompute a point.
+"""
+import os
+import json
+import sqlite3
+import hashlib
+
+import numpy as np
+
+_fileHashes = {}
+
+
+def file_hash(path):
+    """SHA256 of a file's contents (e.g. a TDB file), memoized per process."""
+    path = os.path.abspath(path)
+    if path not in _fileHashes:
+        with open(path, 'rb') as f:
+            _fileHashes[path] = hashlib.sha256(f.read()).hexdigest()
+    return _fileHashes[path]
+
+
+def _jsonable(obj):
+    """Recursively convert NumPy arrays/scalars, tuples and objects with a ``to_dict`` method (e.g. the scheil
+    ``SolidificationResult`` returned by hybrid callables) into JSON-serializable Python objects. Any other object is
+    stored as its string representation."""
+    if isinstance(obj, dict):
+        return {str(k): _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _jsonable(obj.tolist())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if callable(getattr(obj, 'to_dict', None)):
+        return _jsonable(obj.to_dict())
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return str(obj)
+
+
+class ResultStore:
+    """Append-only result store in a SQLite file. Safe to use from several processes at once; each process opens its
+    own connection lazily, so the store itself can be pickled to workers.
+
+    Args:
+        path: Path of the SQLite database file. Created if it does not exist.
+        decimals: Number of decimals compositions are rounded to when forming keys.
+    """
+    def __init__(self, path, decimals=6):
+        self.path = path
+        self.decimals = decimals
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self):
+        return {'path': self.path, 'decimals': self.decimals}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def connection(self):
+        # SQLite connections must not be shared across processes
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, tdb_hash TEXT, elements TEXT, parameters TEXT, composition TEXT, result TEXT)')
+            self._pid = os.getpid()
+        return self._connection
+
+    def make_key(self, tdb_hash, elements, parameters, composition):
+        """Key of a single callable evaluation. Elements are sorted (with the composition permuted accordingly) and
+        the composition is rounded, so equivalent requests map to the same key."""
+        pairs = sorted(zip(elements, composition))
+        rounded = [round(float(x), self.decimals) + 0.0 for _, x in pairs]
+        payload = json.dumps([tdb_hash, [el for el, _ in pairs], parameters, rounded], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest(), [el for el, _ in pairs], rounded
+
+    def get(self, tdb_hash, elements, parameters, composition, default=None):
+        """Stored result of an evaluation, or ``default`` if it was never stored."""
+        key, _, _ = self.make_key(tdb_hash, elements, parameters, composition)
+        row = self.connection.execute('SELECT result FROM results WHERE key = ?', (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def put(self, tdb_hash, elements, parameters, composition, result):
+        """Append a result. If the key is already present (e.g. written by another process), it is left unchanged."""
+        key, sortedElements, rounded = self.make_key(tdb_hash, elements, parameters, composition)
+        self.connection.execute(
+            'INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+            (key, tdb_hash, json.dumps(sortedElements), json.dumps(parameters, sort_keys=True), json.dumps(rounded),
+             json.dumps(_jsonable(result))))
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def wrap(self, func, tdb_file, elements, parameters):
+        """Wrap a generated callable so every invocation first checks the store.
+
+        Args:
+            func: Generated callable, e.g. ``equilibrium_callable``.
+            tdb_file: Thermodynamic database the callable was generated from.
+            elements: Elements of the elemental space, in the order the callable expects compositions.
+            parameters: Constraint parameters the callable was generated with, e.g. the YAML constraint dictionary.
+
+        Returns:
+            StoredCallable: Drop-in replacement for ``func``.
+        """
+        return StoredCallable(self, func, file_hash(tdb_file), list(elements), parameters)
+
+
+class StoredCallable:
+    """Callable returned by ``ResultStore.wrap``. Results found in the store are returned as stored (JSON types, i.e.
+    lists instead of NumPy arrays and the ``to_dict`` of a hybrid callable's ``SolidificationResult``); others are
+    computed, stored and returned. Failed evaluations (None) are not stored."""
+    def __init__(self, store, func, tdb_hash, elements, parameters):
+        self.store = store
+        self.__wrapped__ = func
+        self.tdb_hash = tdb_hash
+        self.elements = elements
+        self.parameters = parameters
+
+    def __call__(self, elP, **kwargs):
+        result = self.store.get(self.tdb_hash, self.elements, self.parameters, elP)
+        if result is None:
+            result = self.__wrapped__(elP, **kwargs)
+            if result is not None:
+                self.store.put(self.tdb_hash, self.elements, self.parameters, elP, result)
+        return result
@@ -1,6 +1,6 @@
 # Template code requireing constants to be defined by the user or AMMap callable builder
 
-from pymatgen.core.periodic_table import Element
+import numpy as np
 from typing import List
 
 def run(point: List[float], verbose: bool = False) -> bool:
@@ -8,11 +8,12 @@ def run(point: List[float], verbose: bool = False) -> bool:
     Check if the point is feasible based on the LC density constraint (MIN/MAX), expressed in g/cm^3, and elemental space it exists in.
     """
     assert 'ELEMENTS' in globals(), 'ELEMENTS has to be defined'
+    assert 'DENSITIES' in globals(), 'DENSITIES has to be defined'
     assert 'MAX' in globals() or 'MIN' in globals(), 'Either MAX or MIN has to be defined. Both can be defined too'
     assert len(point) == len(ELEMENTS), 'The length of the point must match the number of elements'
     
     total = sum(point)
-    weightedDensities = [Element(ELEMENTS[i]).density_of_solid * frac * 0.001 for i, frac in enumerate(point)]
+    weightedDensities = [DENSITIES[i] * frac for i, frac in enumerate(point)]
     density = round(sum(weightedDensities) / total, 6)
     if verbose: print(f"LC density: {density}")
 
@@ -26,11 +27,32 @@ def run(point: List[float], verbose: bool = False) -> bool:
 
     return True
 
+def run_batch(points: List[List[float]]) -> np.ndarray:
+    """
+    Vectorized ``run`` over many points at once (e.g. the whole compositional grid), evaluated as a single
+    matrix-vector product. Returns a boolean mask of feasible points.
+    """
+    assert 'ELEMENTS' in globals(), 'ELEMENTS has to be defined'
+    assert 'DENSITIES' in globals(), 'DENSITIES has to be defined'
+    assert 'MAX' in globals() or 'MIN' in globals(), 'Either MAX or MIN has to be defined. Both can be defined too'
+    points = np.asarray(points, dtype=float)
+    assert points.shape[-1] == len(ELEMENTS), 'The length of every point must match the number of elements'
+    points = points.reshape(-1, len(ELEMENTS))
+
+    density = np.round(points @ np.asarray(DENSITIES) / points.sum(axis=1), 6)
+    feasible = np.ones(len(points), dtype=bool)
+    if 'MAX' in globals():
+        feasible &= density <= MAX
+    if 'MIN' in globals():
+        feasible &= density >= MIN
+    return feasible
+
 if __name__ == '__main__':
     # Example usage
     MIN = 7
     MAX = 8
     ELEMENTS = ['Ni', 'Cr', 'Fe', 'V']
+    DENSITIES = [8.908, 7.14, 7.874, 6.11]
     points = [
         [0.25, 0.25, 0.25, 0.25],
         [1, 0, 0, 0],
@@ -40,4 +62,5 @@ if __name__ == '__main__':
     ]
     print(f"\nChecking points for feasibility in the elemental space: {ELEMENTS} with LC density between {MIN} and {MAX}")
     for point in points:
-        print(run(point, verbose=True))
\ No newline at end of file
+        print(run(point, verbose=True))
+    print(f"Batch evaluation: {run_batch(points)}")
\ No newline at end of file
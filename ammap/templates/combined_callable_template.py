@@ -0,0 +1,81 @@
+import importlib
+import math
+
+import numpy as np
+
+from ammap.callables.cracking import packCurves, getFRArray, getCSCArray, getKouArray, getCDArray
+
+# Generated equilibrium and Scheil callables of the same elemental space (None if not requested). Importing them here
+# loads their database, models and phase records once per worker, shared by every stage of the combined callable.
+equilibrium_module = {equilibrium_module}
+scheil_module = {scheil_module}
+criteria = {criteria}
+
+equilibrium_callable = importlib.import_module(equilibrium_module).equilibrium_callable if equilibrium_module else None
+scheil_callable = importlib.import_module(scheil_module).scheil_callable if scheil_module else None
+
+def cracking_criteria(scheil_result):
+    """
+    Cracking susceptibility criteria of a single Scheil result, computed directly from its in-memory solidification
+    curve with the vectorized criteria of ammap.callables.cracking.
+
+    Returns:
+        dict: Criterion name ('FR', 'Kou', 'CSC', 'iCSC' or 'sRDG') mapped to its value, None where it is undefined.
+    """
+    T, fs, lengths = packCurves([scheil_result['scheilT']], [scheil_result['Sfrac']])
+    values = {{}}
+    CD = None
+    for criterion in criteria:
+        name = criterion.lower()
+        if name == 'fr':
+            values['FR'] = getFRArray([scheil_result['solT']], [scheil_result['liqT']])[0]
+        elif name == 'kou':
+            values['Kou'] = getKouArray(T, fs, lengths)[0]
+        elif name == 'csc':
+            values['CSC'] = getCSCArray(T, fs, lengths)[0]
+        elif name in ('icsc', 'srdg'):
+            # sRDG and iCSC come from the same integration
+            if CD is None:
+                CD = getCDArray(T, fs, lengths)
+            sRDG, iCSC = CD
+            if name == 'icsc':
+                values['iCSC'] = iCSC[0]
+            else:
+                values['sRDG'] = sRDG[0]
+        else:
+            print(f"Warning: Unknown cracking criterion '{{criterion}}' - skipping")
+    return {{name: None if math.isnan(value) else float(value) for name, value in values.items()}}
+
+def combined_callable(elP, seed=None):
+    """
+    Evaluates every requested constraint output of a single composition in one call: equilibrium, Scheil, and the
+    cracking criteria computed from the Scheil result without serializing it in between.
+
+    Args:
+        elP: Composition in the order of the elemental space components.
+        seed: Optional result of a neighboring composition from this callable (or [] in seeded exploration without
+            one); its 'equilibrium' and 'scheil' parts are passed on as seeds of the corresponding stages.
+
+    Returns:
+        dict: 'equilibrium', 'scheil' and 'cracking' results of the stages that were requested. A failed Scheil stage
+        gives None for 'scheil' and 'cracking', without discarding the equilibrium result.
+    """
+    # Without a usable neighbor (seed=[]), the equilibrium stage is still asked for seedable records
+    seeds = seed if isinstance(seed, dict) else {{}}
+    result = {{}}
+    if equilibrium_callable is not None:
+        result['equilibrium'] = equilibrium_callable(elP, seed=seeds.get('equilibrium', None if seed is None else []))
+    if scheil_callable is not None:
+        try:
+            scheil_result = scheil_callable(elP, seed=seeds.get('scheil'))
+            cracking = cracking_criteria(scheil_result) if criteria else None
+        except Exception as e:
+            print(f"Error in the Scheil stage of composition {{elP}}: {{str(e)}}")
+            scheil_result, cracking = None, None
+        result['scheil'] = scheil_result
+        if criteria:
+            result['cracking'] = cracking
+    return result
+
+if __name__ == "__main__":
+    pass
@@ -1,5 +1,5 @@
 from pycalphad import Database, equilibrium, variables as v
-from pycalphad.core.utils import instantiate_models, filter_phases, unpack_components
+from pycalphad.core.utils import instantiate_models, filter_phases, unpack_components, point_sample
 from pycalphad.codegen.callables import build_phase_records
 import numpy as np
 import math
@@ -23,11 +23,59 @@ phase_records = build_phase_records(dbf, comps, phases_filtered, {{v.N, v.P, v.T
 expected_conds = [v.T] + [v.X(el) for el in comps[:-2]]
 default_conds = {{v.P: {pressure}, v.N: 1.0}}
 
-def equilibrium_callable(elP):
+# Number of site fractions of every phase, to validate constitutions passed in as seeds
+n_site_fractions = {{phase: sum(len(subl) for subl in models[phase].constituents) for phase in phases_filtered}}
+
+def _seed_points(seed):
+    """Constitutions per phase that a solved neighbor's records converged to."""
+    points = {{}}
+    for record in seed:
+        for phase, y in zip(record.get('Phases', []), record.get('SiteFractions', [])):
+            if len(y) == n_site_fractions.get(phase):
+                points.setdefault(phase, []).append(y)
+    return {{phase: np.array(ys, dtype=float) for phase, ys in points.items()}}
+
+def _seeded_sampler(ys):
+    """pycalphad's default sampler with the constitutions ``ys`` added to the sampled points."""
+    def sampler(comp_count, pdof=10):
+        return np.concatenate((point_sample(comp_count, pdof=pdof), ys))
+    return sampler
+
+def equilibrium_callable(elP, seed=None, seed_pdens=50):
+    """
+    Equilibrium of a single composition at every temperature of T.
+
+    Args:
+        elP: Composition in the order of elementalSpaceComponents.
+        seed: Records of an already solved neighboring composition (e.g. its parent in the compositional graph),
+            obtained with ``seed`` given, so that they include 'SiteFractions'. Every phase is then sampled as usual
+            but with the lower ``seed_pdens`` point density, and the constitutions the neighbor converged to are added
+            to the sampled points of its phases, so the starting grid keeps the neighbor's solution. If this warm start
+            fails or leaves any temperature unsolved, the composition is solved again with full sampling. Pass an
+            empty list to get 'SiteFractions' without warm starting.
+        seed_pdens: Point density of the sampling of every phase in a warm start.
+
+    Returns:
+        list: Per-temperature records with 'Temperature', 'Phases', 'PhaseFraction' and, if ``seed`` is not None,
+        'SiteFractions'.
+    """
     # Vectorized & safe rounding/clipping of compositions
     elP_arr = np.array(elP)
     elP_round = np.clip(np.round(elP_arr - 1e-6, 6), 1e-7, None)
 
+    if seed:
+        seedPoints = _seed_points(seed)
+        if seedPoints:
+            try:
+                sampler = {{phase: _seeded_sampler(ys) for phase, ys in seedPoints.items()}}
+                output = _equilibrium_records(elP_round, dict(pdens=seed_pdens, sampler=sampler), True)
+                if len(output) == len(T) and all(record['Phases'] for record in output):
+                    return output
+            except Exception:
+                pass
+    return _equilibrium_records(elP_round, dict(pdens=200), seed is not None)
+
+def _equilibrium_records(elP_round, calc_opts, site_fractions=False):
     conds = {{**default_conds, v.T: T}}
     for idx, el in enumerate(comps[:-2]):
         conds[v.X(el)] = float(elP_round[idx])
@@ -35,7 +83,7 @@ def equilibrium_callable(elP):
     eq_res = equilibrium(
         dbf, comps, phases_filtered,
         conds, model=models, phase_records=phase_records,
-        calc_opts=dict(pdens=200)
+        calc_opts=calc_opts
     )
 
     n_temps = len(T)
@@ -52,11 +100,16 @@ def equilibrium_callable(elP):
                 np_data = eq_res.NP.data[0, 0, i].flatten()
                 phasePresentList = [str(pn) for pn in phase_data if pn != '']
                 pFracPresent = [float(pn) for pn in np_data if not math.isnan(pn)]
-                output.append({{
+                record = {{
                     'Temperature': float(T[i]),
                     'Phases': phasePresentList,
                     'PhaseFraction': pFracPresent
-                }})
+                }}
+                if site_fractions:
+                    y_data = eq_res.Y.data[0, 0, i].reshape(-1, eq_res.Y.data.shape[-1])
+                    record['SiteFractions'] = [[float(y) for y in yv if not math.isnan(y)]
+                                               for pn, yv in zip(phase_data, y_data) if pn != '']
+                output.append(record)
             except IndexError:
                 # Skip temperatures that don't have results
                 continue
@@ -78,5 +131,146 @@ def equilibrium_callable(elP):
     
     return output
 
+def _records_from_arrays(phase_data, np_data, temperatures=None):
+    """Converts (temperature, vertex) Phase and NP arrays of a single composition into per-temperature records."""
+    if temperatures is None:
+        temperatures = T
+    output = []
+    for i in range(len(temperatures)):
+        phasePresentList = [str(pn) for pn in phase_data[i] if pn != '']
+        pFracPresent = [float(pn) for pn in np_data[i] if not math.isnan(pn)]
+        output.append({{
+            'Temperature': float(temperatures[i]),
+            'Phases': phasePresentList,
+            'PhaseFraction': pFracPresent
+        }})
+    return output
+
+def equilibrium_feasible(elP, priority_temperatures=None, chunk=4, liquid_phase='LIQUID', seed=None):
+    """
+    Early-exit feasibility check of a single composition against feasible_phases. Instead of the full temperature
+    sweep, temperatures are solved in chunks of ``chunk`` (one pycalphad call each), starting with
+    ``priority_temperatures`` (e.g. where neighboring points failed) and then from the lowest temperature up, where
+    forbidden solid phases are most likely to appear. The sweep stops at the first temperature with a phase outside
+    feasible_phases; temperatures with liquid present are not judged, as in ``ammap.core.is_feasible``.
+
+    ``seed`` is the result of a solved neighbor, as passed by ``Explorer(seeded=True)``; if that neighbor failed, its
+    FailedTemperature is checked first. Any other seed (e.g. the ``[]`` of starting nodes) is ignored.
+
+    Returns:
+        dict: 'Feasible' (bool), 'FailedTemperature' (first infeasible temperature found, or None), and 'Results',
+        the per-temperature records (as in equilibrium_callable) of the temperatures solved, sorted from high to low.
+    """
+    elP_round = np.clip(np.round(np.array(elP, dtype=float) - 1e-6, 6), 1e-7, None)
+    allowed = set(feasible_phases)
+
+    priority = list(priority_temperatures or [])
+    if isinstance(seed, dict) and seed.get('FailedTemperature') is not None:
+        priority.insert(0, seed['FailedTemperature'])
+    order = []
+    for t in priority:
+        if t in T and float(t) not in order:
+            order.append(float(t))
+    order += [float(t) for t in np.sort(T) if float(t) not in order]
+
+    records = []
+    failedTemperature = None
+    for start in range(0, len(order), chunk):
+        temperatures = order[start:start + chunk]
+        # Solved and labelled on the same ascending array; the feasibility check below keeps the priority order
+        solvedTemperatures = np.sort(temperatures)
+        conds = {{**default_conds, v.T: solvedTemperatures}}
+        for idx, el in enumerate(comps[:-2]):
+            conds[v.X(el)] = float(elP_round[idx])
+        eq_res = equilibrium(
+            dbf, comps, phases_filtered,
+            conds, model=models, phase_records=phase_records,
+            calc_opts=dict(pdens=200)
+        )
+        point = {{str(v.X(el)): 0 for el in comps[:-2]}}
+        phase_data = eq_res.Phase.isel(N=0, P=0).isel(point).transpose('T', 'vertex').values
+        np_data = eq_res.NP.isel(N=0, P=0).isel(point).transpose('T', 'vertex').values
+        chunkRecords = _records_from_arrays(phase_data, np_data, solvedTemperatures)
+        records += chunkRecords
+
+        for temperature in temperatures:
+            record = next(r for r in chunkRecords if r['Temperature'] == temperature)
+            if liquid_phase in record['Phases']:
+                continue
+            if not record['Phases'] or not set(record['Phases']).issubset(allowed):
+                failedTemperature = float(temperature)
+                break
+        if failedTemperature is not None:
+            break
+
+    return {{
+        'Feasible': failedTemperature is None,
+        'FailedTemperature': failedTemperature,
+        'Results': sorted(records, key=lambda r: -r['Temperature'])
+    }}
+
+def equilibrium_batch(elPs):
+    """
+    Solves a whole list of compositions (e.g. a BFS frontier) with as few pycalphad calls as possible and returns,
+    for each composition, the same list of per-temperature records as equilibrium_callable. Compositions that fail
+    to solve get None.
+
+    pycalphad broadcasts conditions as an outer product, so compositions are grouped by all but one independent mole
+    fraction (the one giving the fewest groups) and every group is solved in a single call vectorized over the
+    temperature axis and the remaining mole fraction. Only real grid points are ever passed to the solver.
+    """
+    if len(elPs) == 0:
+        return []
+    elP_round = np.clip(np.round(np.array(elPs, dtype=float) - 1e-6, 6), 1e-7, None)
+    x_names = [str(v.X(el)) for el in comps[:-2]]
+    n_indep = len(x_names)
+
+    # Pick the composition axis to vectorize over
+    axis = None
+    if n_indep > 0:
+        groupCounts = [len(set(map(tuple, np.delete(elP_round[:, :n_indep], a, axis=1)))) for a in range(n_indep)]
+        axis = int(np.argmin(groupCounts))
+
+    groups = {{}}
+    for i, row in enumerate(elP_round[:, :n_indep]):
+        key = tuple(val for idx, val in enumerate(row) if idx != axis)
+        groups.setdefault(key, []).append(i)
+
+    output = [None] * len(elPs)
+    for members in groups.values():
+        axisValues = np.unique(elP_round[members, axis]) if axis is not None else None
+        conds = {{**default_conds, v.T: T}}
+        for idx, el in enumerate(comps[:-2]):
+            if idx == axis:
+                conds[v.X(el)] = axisValues
+            else:
+                conds[v.X(el)] = float(elP_round[members[0], idx])
+        try:
+            eq_res = equilibrium(
+                dbf, comps, phases_filtered,
+                conds, model=models, phase_records=phase_records,
+                calc_opts=dict(pdens=200)
+            )
+        except Exception:
+            # Fall back to single-composition calls so one bad point does not fail the whole group
+            for i in members:
+                try:
+                    output[i] = equilibrium_callable(elPs[i])
+                except Exception:
+                    output[i] = None
+            continue
+
+        phase_arr = eq_res.Phase.isel(N=0, P=0)
+        np_arr = eq_res.NP.isel(N=0, P=0)
+        for i in members:
+            point = {{name: 0 for name in x_names}}
+            if axis is not None:
+                point[x_names[axis]] = int(np.searchsorted(axisValues, elP_round[i, axis]))
+            phase_data = phase_arr.isel(point).transpose('T', 'vertex').values
+            np_data = np_arr.isel(point).transpose('T', 'vertex').values
+            output[i] = _records_from_arrays(phase_data, np_data)
+
+    return output
+
 if __name__ == "__main__":
     pass
\ No newline at end of file
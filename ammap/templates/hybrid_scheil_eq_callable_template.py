@@ -6,6 +6,9 @@ from pycalphad import Database, equilibrium, variables as v
 from pycalphad.core.utils import filter_phases, instantiate_models, unpack_components
 from pycalphad.codegen.callables import build_phase_records
 
+from ammap.callables.solidification import (find_liquidus, solve_local_equilibria, integrate_phase_fractions,
+                                            merge_local_compositions, estimate_merge_error)
+
 dbf = Database("{dbf_path}")
 
 T = {start_temp}
@@ -20,23 +23,46 @@ phase_records = build_phase_records(
     {{v.N, v.P, v.T}},
     models=models
 )
+thermo = dict(dbf=dbf, comps=comps, phases_filtered=phases_filtered, models=models, phase_records=phase_records)
 
 liquid_phase_name = '{liquid_phase}'
 step_temperature = {step_temp}
 temp_min = {temp_min}
 temp_max = {temp_max}
 temp_step = {temp_step}
+# Consecutive local compositions whose mole fractions all differ by at most this much are merged before the
+# equilibrium stage (0 disables merging)
+composition_tolerance = {composition_tolerance}
+# Start every Scheil simulation just above the liquidus located by ammap.callables.solidification.find_liquidus
+# instead of at T, skipping the fully liquid region
+liquidus_search = {liquidus_search}
+
+def hybrid_scheil_callable(elP, seed=None):
+    """
+    Scheil-Gulliver solidification started at T (or, with liquidus_search, one step above the liquidus), followed by
+    equilibrium calculations of the local solid compositions over the configured temperature range.
 
-def hybrid_scheil_callable(elP):
+    Args:
+        elP: Composition in the order of elementalSpaceComponents.
+        seed: Optional liquidus hint for liquidus_search: the result of a neighboring composition (its 'liqT' is used)
+            or a temperature.
+    """
     # Use the same composition handling as scheil_callable
     elP_round = [round(v-0.000001, 6) if v>0.000001 else 0.0000001 for v in elP]
     initial_composition = dict(zip([v.X(el) for el in comps[:-2]], elP_round))
 
     # Run Scheil simulation with configurable density
     try:
+        start_temperature = T
+        if liquidus_search:
+            hint = seed.get('liqT') if isinstance(seed, dict) else seed if isinstance(seed, (int, float)) else None
+            liquidus = find_liquidus(thermo, initial_composition, T, step_temperature, hint,
+                                     liquidPhase=liquid_phase_name)
+            if liquidus is not None:
+                start_temperature = min(T, liquidus + step_temperature)
         sol_res = simulate_scheil_solidification(
             dbf, comps, phases_filtered,
-            initial_composition, T, step_temperature=step_temperature)
+            initial_composition, start_temperature, step_temperature=step_temperature)
     except Exception as e:
         return {{
             'scheil_result': None,
@@ -49,6 +75,7 @@ def hybrid_scheil_callable(elP):
     Sfrac = sol_res.fraction_solid
     x_phases = sol_res.x_phases  # Phase compositions
     cum_phase_amounts = sol_res.cum_phase_amounts  # Cumulative phase amounts
+    liqT = next((temp for temp, frac in zip(scheilT, Sfrac) if frac > 0), scheilT[-1])
     
     # Calculate local compositions with HIGH DENSITY (~200 solid fraction points)
     local_compositions = []
@@ -134,90 +161,45 @@ def hybrid_scheil_callable(elP):
             'index': len(Sfrac)-1 if Sfrac else 0
         }}]
     
+    # Merge nearly identical local compositions before the equilibrium stage
+    sampled_count = len(local_compositions)
+    sampled_weight = sum(local_data['solid_fraction'] for local_data in local_compositions)
+    local_compositions, radii = merge_local_compositions(local_compositions, composition_tolerance)
+
     # Perform equilibrium calculations at configurable temperature range
     T_eq_array = np.arange(temp_min, temp_max + temp_step, temp_step)  # Include endpoint
+    cells, failed_cells = solve_local_equilibria(thermo, local_compositions, T_eq_array)
+
+    # Integration across ALL solid fraction points
+    weights = [local_data['solid_fraction'] for local_data in local_compositions]
+    phase_names, integrated, present, successful = integrate_phase_fractions(cells, weights)
+    estimated_error = estimate_merge_error(local_compositions, radii, cells, weights)
     eq_results = []
-    
-    for T_eq in T_eq_array:
-        phase_fractions_at_T = []
-        successful_calcs = 0
-        
-        # Run equilibrium with ALL local compositions
-        for local_data in local_compositions:
-            try:
-                # Set up equilibrium conditions
-                conds = {{v.T: float(T_eq), v.P: 101325, v.N: 1.0}}
-                conds.update(local_data['composition'])
-                
-                # Run equilibrium calculation
-                eq = equilibrium(
-                    dbf, comps, phases_filtered,
-                    conds, model=models, phase_records=phase_records
-                )
-                
-                # Extract phase fractions
-                if eq is not None and hasattr(eq, 'NP'):
-                    np_data = eq.NP.data.flatten()
-                    phase_data = eq.Phase.data.flatten()
-                    
-                    valid_phases = [str(p) for p in phase_data if str(p) != '']
-                    valid_amounts = [float(a) for a in np_data if not math.isnan(a)]
-                    
-                    if valid_phases and valid_amounts:
-                        phase_fractions_at_T.append({{
-                            'phases': valid_phases,
-                            'amounts': valid_amounts,
-                            'weight': local_data['solid_fraction'],
-                            'composition': local_data['composition']
-                        }})
-                        successful_calcs += 1
-                    
-            except Exception:
-                continue
-        
-        # Integration across ALL solid fraction points
-        if phase_fractions_at_T:
-            # Calculate weighted average of phase fractions across ALL local compositions
-            all_phases = set()
-            for pf in phase_fractions_at_T:
-                all_phases.update(pf['phases'])
-            
-            integrated_phases = {{}}
-            total_weight = sum(pf['weight'] for pf in phase_fractions_at_T)
-            
-            for phase in all_phases:
-                weighted_sum = 0
-                contributing_weight = 0
-                
-                for pf in phase_fractions_at_T:
-                    if phase in pf['phases']:
-                        phase_idx = pf['phases'].index(phase)
-                        if phase_idx < len(pf['amounts']):
-                            phase_fraction = pf['amounts'][phase_idx]
-                            weight = pf['weight']
-                            weighted_sum += phase_fraction * weight
-                            contributing_weight += weight
-                
-                if contributing_weight > 0:
-                    integrated_phases[phase] = weighted_sum / contributing_weight
-            
-            # Normalize phase fractions
-            total_phase_fraction = sum(integrated_phases.values())
-            if total_phase_fraction > 0:
-                for phase in integrated_phases:
-                    integrated_phases[phase] /= total_phase_fraction
-            
+    for t, T_eq in enumerate(T_eq_array):
+        if successful[t] > 0:
             eq_results.append({{
                 'Temperature': float(T_eq),
-                'PhaseFractions': integrated_phases,
+                'PhaseFractions': {{phase: float(integrated[t, k]) for k, phase in enumerate(phase_names)
+                                   if present[t, k]}},
                 # 'SuccessfulCalculations': successful_calcs,
                 # 'TotalLocalCompositions': len(local_compositions)
             }})
     
     return {{
         'scheil_result': sol_res,
+        'liqT': float(liqT),
         'equilibrium_results': eq_results,
+        'failed_cells': failed_cells,
         'local_compositions_count': len(local_compositions),
+        'sampled_compositions_count': sampled_count,
+        # Share of the solid-fraction weight carried by merged compositions, and the estimated change of the integrated
+        # phase fractions due to merging at every temperature (an estimate, not a bound; see estimate_merge_error)
+        'merge_error_estimate': {{
+            'merged_weight_fraction': float(sum(local_data['solid_fraction'] for local_data in local_compositions
+                                                if local_data.get('merged_count', 1) > 1) / sampled_weight)
+                                      if sampled_weight > 0 else 0.0,
+            'estimated': {{float(T_eq): float(error) for T_eq, error in zip(T_eq_array, estimated_error)}}
+        }},
         'temperature_range': (temp_min, temp_max, temp_step)
     }}
 
@@ -6,6 +6,9 @@ from pycalphad import Database, equilibrium, variables as v
 from pycalphad.core.utils import filter_phases, instantiate_models, unpack_components
 from pycalphad.codegen.callables import build_phase_records
 
+from ammap.callables.solidification import (find_liquidus, solve_local_equilibria, integrate_phase_fractions,
+                                            merge_local_compositions, estimate_merge_error)
+
 # --- Constants and placeholders defined at module level ---
 DBF_PATH = "{dbf_path}"
 ELEMENTAL_SPACE_COMPONENTS = {elements}
@@ -15,6 +18,12 @@ STEP_TEMPERATURE = {step_temp}
 TEMP_MIN = {temp_min}
 TEMP_MAX = {temp_max}
 TEMP_STEP = {temp_step}
+# Consecutive local compositions whose mole fractions all differ by at most this much are merged before the
+# equilibrium stage (0 disables merging)
+COMPOSITION_TOLERANCE = {composition_tolerance}
+# Start every Scheil simulation just above the liquidus located by ammap.callables.solidification.find_liquidus
+# instead of at START_TEMP, skipping the fully liquid region
+LIQUIDUS_SEARCH = {liquidus_search}
 
 # --- Module-level cache to store initialized objects ---
 # This dictionary is unique to each generated callable module.
@@ -43,10 +52,14 @@ def _initialize_thermo_objects():
     _thermo_cache['phase_records'] = phase_records
 
 
-def hybrid_scheil_callable(elP):
+def hybrid_scheil_callable(elP, seed=None):
     """
     Main callable function for Scheil and equilibrium calculations.
     It ensures thermodynamic objects are initialized before running simulations.
+
+    With LIQUIDUS_SEARCH, the Scheil simulation starts one step above the liquidus instead of at START_TEMP; ``seed``
+    is then an optional liquidus hint, either the result of a neighboring composition (its 'liqT' is used) or a
+    temperature.
     """
     # If the cache is empty, this is the first time this callable
     # is being run in this worker process. Initialize everything.
@@ -67,17 +80,25 @@ def hybrid_scheil_callable(elP):
     try:
         conds = {{v.T: START_TEMP, v.P: 101325, v.N: 1.0}}
         conds.update(initial_composition_dict)
-        eq_start = equilibrium(dbf, comps, phases_filtered, conds, model=models)
-        
+        eq_start = equilibrium(dbf, comps, phases_filtered, conds, model=models, phase_records=phase_records)
+
         phases_present = [str(p) for p in eq_start.Phase.values.flatten() if p]
 
         if [LIQUID_PHASE_NAME] != phases_present:
-             return {{
+            return {{
                 'scheil_result': None,
                 'equilibrium_results': [],
                 'error': 'Initial state at ' + str(START_TEMP) + 'K is not 100% liquid. Phases found: ' + str(phases_present)
             }}
-            
+
+        start_temperature = START_TEMP
+        if LIQUIDUS_SEARCH:
+            hint = seed.get('liqT') if isinstance(seed, dict) else seed if isinstance(seed, (int, float)) else None
+            liquidus = find_liquidus(_thermo_cache, initial_composition_dict, START_TEMP, STEP_TEMPERATURE, hint,
+                                     liquidPhase=LIQUID_PHASE_NAME)
+            if liquidus is not None:
+                start_temperature = min(START_TEMP, liquidus + STEP_TEMPERATURE)
+
     except Exception as e:
         return {{
             'scheil_result': None,
@@ -89,7 +110,7 @@ def hybrid_scheil_callable(elP):
     try:
         sol_res = simulate_scheil_solidification(
             dbf, comps, phases_filtered,
-            initial_composition_dict, START_TEMP, step_temperature=STEP_TEMPERATURE)
+            initial_composition_dict, start_temperature, step_temperature=STEP_TEMPERATURE)
     except Exception as e:
         return {{
             'scheil_result': None,
@@ -109,6 +130,7 @@ def hybrid_scheil_callable(elP):
     scheilT = sol_res.temperatures.flatten()
     cum_phase_amounts = sol_res.cum_phase_amounts
     x_phases = sol_res.x_phases
+    liqT = next((temp for temp, frac in zip(scheilT, Sfrac) if frac > 0), scheilT[-1])
 
     # Extract solidification path data and convert to serializable format
     scheil_result_serializable = {{
@@ -202,83 +224,44 @@ def hybrid_scheil_callable(elP):
             'index': len(Sfrac)-1 if len(Sfrac) > 0 else 0
         }}]
     
+    # Merge nearly identical local compositions before the equilibrium stage
+    sampled_count = len(local_compositions)
+    sampled_weight = sum(local_data['solid_fraction'] for local_data in local_compositions)
+    local_compositions, radii = merge_local_compositions(local_compositions, COMPOSITION_TOLERANCE)
+
     # Perform equilibrium calculations at configurable temperature range
     T_eq_array = np.arange(TEMP_MIN, TEMP_MAX + TEMP_STEP, TEMP_STEP)  # Include endpoint
+    cells, failed_cells = solve_local_equilibria(_thermo_cache, local_compositions, T_eq_array)
+
+    weights = [local_data['solid_fraction'] for local_data in local_compositions]
+    phase_names, integrated, present, successful = integrate_phase_fractions(cells, weights)
+    estimated_error = estimate_merge_error(local_compositions, radii, cells, weights)
     eq_results = []
-    
-    for T_eq in T_eq_array:
-        phase_fractions_at_T = []
-        successful_calcs = 0
-        
-        for local_data in local_compositions:
-            try:
-                conds = {{v.T: float(T_eq), v.P: 101325, v.N: 1.0}}
-                conds.update(local_data['composition'])
-                
-                eq = equilibrium(
-                    dbf, comps, phases_filtered,
-                    conds, model=models, phase_records=phase_records
-                )
-                
-                if eq is not None and hasattr(eq, 'NP'):
-                    np_data = eq.NP.data.flatten()
-                    phase_data = eq.Phase.data.flatten()
-                    
-                    valid_phases = [str(p) for p in phase_data if str(p) != '']
-                    valid_amounts = [float(a) for a in np_data if not math.isnan(a)]
-                    
-                    if valid_phases and valid_amounts:
-                        phase_fractions_at_T.append({{
-                            'phases': valid_phases,
-                            'amounts': valid_amounts,
-                            'weight': local_data['solid_fraction'],
-                            'composition': local_data['composition']
-                        }})
-                        successful_calcs += 1
-                    
-            except Exception:
-                continue
-        
-        if phase_fractions_at_T:
-            all_phases = set()
-            for pf in phase_fractions_at_T:
-                all_phases.update(pf['phases'])
-            
-            integrated_phases = {{}}
-            total_weight = sum(pf['weight'] for pf in phase_fractions_at_T)
-            
-            for phase in all_phases:
-                weighted_sum = 0
-                contributing_weight = 0
-                
-                for pf in phase_fractions_at_T:
-                    if phase in pf['phases']:
-                        phase_idx = pf['phases'].index(phase)
-                        if phase_idx < len(pf['amounts']):
-                            phase_fraction = pf['amounts'][phase_idx]
-                            weight = pf['weight']
-                            weighted_sum += phase_fraction * weight
-                            contributing_weight += weight
-                
-                if contributing_weight > 0:
-                    integrated_phases[phase] = weighted_sum / contributing_weight
-            
-            total_phase_fraction = sum(integrated_phases.values())
-            if total_phase_fraction > 0:
-                for phase in integrated_phases:
-                    integrated_phases[phase] /= total_phase_fraction
-            
+    for t, T_eq in enumerate(T_eq_array):
+        if successful[t] > 0:
             eq_results.append({{
                 'Temperature': float(T_eq),
-                'PhaseFractions': integrated_phases,
-                'SuccessfulCalculations': successful_calcs,
+                'PhaseFractions': {{phase: float(integrated[t, k]) for k, phase in enumerate(phase_names)
+                                   if present[t, k]}},
+                'SuccessfulCalculations': int(successful[t]),
                 'TotalLocalCompositions': len(local_compositions)
             }})
     
     return {{
         'scheil_result': scheil_result_serializable,
+        'liqT': float(liqT),
         'equilibrium_results': eq_results,
+        'failed_cells': failed_cells,
         'local_compositions_count': len(local_compositions),
+        'sampled_compositions_count': sampled_count,
+        # Share of the solid-fraction weight carried by merged compositions, and the estimated change of the integrated
+        # phase fractions due to merging at every temperature (an estimate, not a bound; see estimate_merge_error)
+        'merge_error_estimate': {{
+            'merged_weight_fraction': float(sum(local_data['solid_fraction'] for local_data in local_compositions
+                                                if local_data.get('merged_count', 1) > 1) / sampled_weight)
+                                      if sampled_weight > 0 else 0.0,
+            'estimated': {{float(T_eq): float(error) for T_eq, error in zip(T_eq_array, estimated_error)}}
+        }},
         'temperature_range': (TEMP_MIN, TEMP_MAX, TEMP_STEP)
     }}
 
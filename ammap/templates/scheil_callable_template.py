@@ -1,10 +1,14 @@
 from scheil import simulate_scheil_solidification
-from pycalphad import Database, variables as v
+from pycalphad import Database, equilibrium, variables as v
 from pycalphad.core.utils import instantiate_models, filter_phases, unpack_components
 from pycalphad.codegen.callables import build_phase_records
+from types import SimpleNamespace
+import numpy as np
 import pandas as pd
 import math
 
+from ammap.callables.solidification import find_liquidus
+
 dbf = Database("{tdb_file}")
 T = {scheil_start_temperature}
 elementalSpaceComponents = {elements}
@@ -14,17 +18,151 @@ comps = [s.upper() for s in elementalSpaceComponents] + ['VA']
 phases_filtered = filter_phases(dbf, unpack_components(dbf, comps), phases)
 models = instantiate_models(dbf, comps, phases_filtered)
 phase_records = build_phase_records(dbf, comps, phases_filtered, {{v.N, v.P, v.T}}, models=models)
+thermo = dict(dbf=dbf, comps=comps, phases_filtered=phases_filtered, models=models, phase_records=phase_records)
 
 liquid_phase_name = '{liquid_phase_name}'
 step_temperature = {step_temperature}
+# Start every simulation just above the liquidus located by ammap.callables.solidification.find_liquidus instead of
+# at T, skipping the fully liquid region
+liquidus_search = {liquidus_search}
+
+# Adaptive temperature stepping: steps grow up to max_step_temperature while the solid fraction changes by less than
+# tolerance per step and the phase set is unchanged, and are refined (down to a quarter of step_temperature) where it
+# changes faster. Between 0.4 and 0.99 solid fraction (used by the cracking criteria) steps never exceed
+# step_temperature.
+adaptive = {adaptive}
+tolerance = {tolerance}
+max_step_temperature = {max_step_temperature}
+
+def _simulate_scheil_adaptive(initial_composition, start_temperature, stop=0.0001):
+    """
+    Scheil-Gulliver solidification with adaptive temperature steps, returning an object with the attributes of the
+    ``scheil`` solidification result used by scheil_callable. As in ``simulate_scheil_solidification``, the liquid
+    composition of every step is the starting composition of the next one, and the remaining liquid solidifies at the
+    last temperature if it vanishes before the ``stop`` fraction is reached.
+    """
+    solid_phases = sorted(set(phases_filtered) - {{liquid_phase_name}})
+    elements = comps[:-1]
+    independent = [str(key)[2:] for key in initial_composition]
+    minimum_step = step_temperature / 4
+
+    temp = float(start_temperature)
+    liquid_comp = dict(initial_composition)
+    temperatures = [temp]
+    fraction_solid = [0.0]
+    phase_amounts = {{phase: [0.0] for phase in solid_phases}}
+    x_phases = {{phase: {{el: [np.nan] for el in elements}} for phase in phases_filtered}}
+    y_phases = {{phase: [np.nan] for phase in phases_filtered}}
+    startX = {{el: float(initial_composition.get(v.X(el), np.nan)) for el in elements}}
+    startX[elements[-1]] = 1 - sum(x for el, x in startX.items() if el != elements[-1])
+    for el in elements:
+        x_phases[liquid_phase_name][el][0] = startX[el]
+
+    step = max_step_temperature
+    previous_phases = {{liquid_phase_name}}
+    converged = False
+    eq_phases, eq_amounts = [], np.array([])
+    while temp - step > 0:
+        conds = {{v.T: temp - step, v.P: 101325, v.N: 1.0, **liquid_comp}}
+        eq = equilibrium(dbf, comps, phases_filtered, conds, model=models, phase_records=phase_records)
+        eq_phases = [str(phase) for phase in eq.Phase.values.squeeze().ravel()]
+        eq_amounts = eq.NP.values.squeeze().ravel()
+        present = {{phase for phase in eq_phases if phase}}
+
+        if liquid_phase_name not in present:
+            # Liquid vanished within the step: zero in on the last liquid-bearing temperature
+            if step > minimum_step:
+                step = max(step / 2, minimum_step)
+                continue
+            break
+
+        amounts = {{phase: float(np.nansum(eq_amounts[np.array(eq_phases) == phase])) for phase in solid_phases}}
+        d_fs = (1 - fraction_solid[-1]) * sum(amounts.values())
+        in_window = fraction_solid[-1] < 0.99 and fraction_solid[-1] + d_fs >= 0.4
+        if (present != previous_phases or in_window) and step > step_temperature:
+            step = max(step / 2, step_temperature)
+            continue
+        if d_fs > tolerance and step > minimum_step:
+            step = max(step / 2, minimum_step)
+            continue
+
+        # Accept the step
+        temp -= step
+        X = eq.X.values.squeeze().reshape(len(eq_phases), -1)
+        Y = eq.Y.values.squeeze().reshape(len(eq_phases), -1)
+        components = [str(c) for c in eq.component.values]
+        liquid_vertex = eq_phases.index(liquid_phase_name)
+        liquid_comp = {{v.X(el): float(X[liquid_vertex, components.index(el)]) for el in independent}}
+        for phase in phases_filtered:
+            vertex = eq_phases.index(phase) if phase in eq_phases else None
+            for el in elements:
+                x_phases[phase][el].append(np.nan if vertex is None else float(X[vertex, components.index(el)]))
+            y_phases[phase].append(np.nan if vertex is None else Y[vertex][~np.isnan(Y[vertex])])
+        for phase in solid_phases:
+            phase_amounts[phase].append((1 - fraction_solid[-1]) * amounts[phase])
+        fraction_solid.append(fraction_solid[-1] + d_fs)
+        temperatures.append(temp)
 
-def scheil_callable(elP):
+        if 1 - fraction_solid[-1] < stop:
+            converged = True
+            break
+        if d_fs < tolerance / 4 and present == previous_phases:
+            step = min(step * 2, max_step_temperature)
+        if 0.4 <= fraction_solid[-1] < 0.99:
+            step = min(step, step_temperature)
+        previous_phases = present
+
+    if not converged:
+        # Solidify the remaining liquid into the solid phases of the last equilibrium
+        amounts = {{phase: float(np.nansum(eq_amounts[np.array(eq_phases) == phase])) for phase in solid_phases}}
+        solid_total = sum(amounts.values())
+        for phase in solid_phases:
+            share = amounts[phase] / solid_total if solid_total > 0 else 0.0
+            phase_amounts[phase].append((1 - fraction_solid[-1]) * share)
+        for phase in phases_filtered:
+            for el in elements:
+                x_phases[phase][el].append(np.nan)
+            y_phases[phase].append(np.nan)
+        fraction_solid.append(1.0)
+        temperatures.append(temp)
+
+    return SimpleNamespace(
+        temperatures=temperatures,
+        fraction_solid=fraction_solid,
+        fraction_liquid=(1.0 - np.array(fraction_solid)).tolist(),
+        cum_phase_amounts={{phase: np.cumsum(amounts).tolist() for phase, amounts in phase_amounts.items()}},
+        x_phases={{phase: {{el: np.array(x) for el, x in xs.items()}} for phase, xs in x_phases.items()}},
+        Y_phases=y_phases,
+        converged=converged
+    )
+
+def scheil_callable(elP, seed=None):
+    """
+    Scheil-Gulliver solidification of a single composition, started at T or, with liquidus_search, one step above its
+    liquidus (or at T if T is not fully liquid).
+
+    Args:
+        elP: Composition in the order of elementalSpaceComponents.
+        seed: Optional liquidus hint for liquidus_search: the result of a neighboring composition (its 'liqT' is used)
+            or a temperature.
+    """
     elP_round = [round(v-0.000001, 6) if v>0.000001 else 0.0000001 for v in elP]
     initial_composition = dict(zip([v.X(el) for el in comps[:-2]], elP_round))
-    
-    sol_res = simulate_scheil_solidification(
-        dbf, comps, phases_filtered,
-        initial_composition, T, step_temperature=step_temperature)
+
+    start_temperature = T
+    if liquidus_search:
+        hint = seed.get('liqT') if isinstance(seed, dict) else seed if isinstance(seed, (int, float)) else None
+        liquidus = find_liquidus(thermo, initial_composition, T, step_temperature, hint, liquidPhase=liquid_phase_name)
+        # One extra step of margin, as single-point equilibria right at the liquidus can be noisy
+        if liquidus is not None:
+            start_temperature = min(T, liquidus + step_temperature)
+
+    if adaptive:
+        sol_res = _simulate_scheil_adaptive(initial_composition, start_temperature)
+    else:
+        sol_res = simulate_scheil_solidification(
+            dbf, comps, phases_filtered,
+            initial_composition, start_temperature, step_temperature=step_temperature)
 
     phaseFractions = {{}}
     for phase, amounts in sol_res.cum_phase_amounts.items():
@@ -0,0 +1,28 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from ammap.core import CompositionalGraph
+
+
+@pytest.fixture
+def simplex_graph():
+    """Factory of the compositional graph of a ``dim``-component simplex with ``nDiv`` divisions, connected like the
+    nimplex neighbor lists (moving one step of one component to another)."""
+    def build(dim, nDiv):
+        points = np.array([list(p) + [nDiv - sum(p)] for p in itertools.product(range(nDiv + 1), repeat=dim - 1)
+                           if sum(p) <= nDiv])
+        index = {tuple(p): i for i, p in enumerate(points)}
+        nList = []
+        for p in points:
+            neighbors = []
+            for i, j in itertools.permutations(range(dim), 2):
+                if p[i] > 0:
+                    q = p.copy()
+                    q[i] -= 1
+                    q[j] += 1
+                    neighbors.append(index[tuple(q)])
+            nList.append(neighbors)
+        return CompositionalGraph.from_adjacency(nList, points / nDiv, points, [f"E{i}" for i in range(dim)])
+    return build
@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from ammap.checkpoint import ExplorationCheckpoint
+
+
+def test_resume_restores_state(tmp_path):
+    path = str(tmp_path / "run")
+    checkpoint = ExplorationCheckpoint(path, 20)
+    checkpoint.add_seeds([0, 19])
+    checkpoint.append(0, True, [{'Temperature': 1000.0, 'Phases': ['FCC_A1'], 'PhaseFraction': np.array([1.0])}])
+    checkpoint.append(5, False, None)
+    checkpoint.append(13, True, {'liqT': np.float64(1600.0)})
+    checkpoint.close()
+
+    resumed = ExplorationCheckpoint(path, 20)
+    assert np.flatnonzero(resumed.completed).tolist() == [0, 5, 13]
+    assert np.flatnonzero(resumed.feasible).tolist() == [0, 13]
+    assert resumed.seeds == [0, 19]
+    assert list(resumed.iter_results()) == [
+        (0, True, [{'Temperature': 1000.0, 'Phases': ['FCC_A1'], 'PhaseFraction': [1.0]}]),
+        (5, False, None),
+        (13, True, {'liqT': 1600.0})]
+    resumed.close()
+
+
+def test_resume_after_crash(tmp_path):
+    path = str(tmp_path / "run")
+    checkpoint = ExplorationCheckpoint(path, 20)
+    checkpoint.append(3, True, None)
+    checkpoint.close()
+    # A crash after a log record was written but before the bitsets were updated, in the middle of the next record
+    with open(f"{path}.log", 'ab') as f:
+        f.write((json.dumps({'i': 7, 'f': True, 'r': None}) + '\n').encode())
+        f.write(b'{"i": 8, "f": tr')
+
+    resumed = ExplorationCheckpoint(path, 20)
+    assert np.flatnonzero(resumed.completed).tolist() == [3, 7]
+    assert np.flatnonzero(resumed.feasible).tolist() == [3, 7]
+    resumed.append(8, False, None)
+    resumed.close()
+    assert [node for node, _, _ in ExplorationCheckpoint(path, 20).iter_results()] == [3, 7, 8]
+
+
+def test_frontier(tmp_path, simplex_graph):
+    graph = simplex_graph(3, 4)
+    checkpoint = ExplorationCheckpoint(str(tmp_path / "run"), graph.nNodes)
+    checkpoint.add_seeds([0, graph.nNodes - 1])
+    checkpoint.append(0, True, None)
+    checkpoint.append(1, False, None)
+    neighbors = set(graph.indices[graph.edge_sources() == 0].tolist())
+    assert checkpoint.frontier(graph) == sorted((neighbors | {graph.nNodes - 1}) - {0, 1})
+    checkpoint.close()
+
+
+def test_graph_size_mismatch(tmp_path):
+    ExplorationCheckpoint(str(tmp_path / "run"), 20).close()
+    with pytest.raises(ValueError):
+        ExplorationCheckpoint(str(tmp_path / "run"), 30)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from ammap.callables.cracking import (getCSC, getKou, getCD, getIntegral, getNeighborCSC, getNeighborKou, packCurves,
+                                      getCSCArray, getKouArray)
+
+
+@pytest.fixture(scope="module")
+def curves():
+    """Random Scheil-like curves (decreasing temperature, increasing solid fraction), with missing and short ones."""
+    rng = np.random.default_rng(0)
+    temperature, solidFraction = [], []
+    for k in range(1000):
+        n = rng.integers(10, 120) if k % 50 else rng.integers(1, 10)
+        temperature.append(np.sort(1800 - rng.random(n) * rng.choice([30, 400, 1500]))[::-1].tolist())
+        solidFraction.append(np.sort(rng.random(n) ** rng.choice([0.3, 1, 3])).tolist())
+    temperature[7] = solidFraction[7] = None
+    return temperature, solidFraction
+
+
+def referenceCD(temperature, solidFraction, CDPoints=(0.7, 0.98), numDataThreshold=10):
+    """The original point-by-point sRDG and iCSC."""
+    fs_0, fs_co = sorted(CDPoints)
+    CD1, CD2 = [], []
+    for Temperature, solidFrac in zip(temperature, solidFraction):
+        if Temperature is None or len(Temperature) < numDataThreshold:
+            CD1.append(None)
+            CD2.append(None)
+            continue
+        T0 = np.interp(fs_0, solidFrac, Temperature)
+        Tco = np.interp(fs_co, solidFrac, Temperature)
+        for index in range(len(Temperature)):
+            if Temperature[index] <= T0:
+                break
+        Temperature = Temperature[index:][::-1]
+        solidFrac = solidFrac[index:][::-1]
+        deltT = min((T0 - Tco) / 10, 10)
+        if not np.isfinite(deltT) or deltT == 0:
+            CD1.append(None)
+            CD2.append(None)
+            continue
+        Trange = list(np.arange(Tco, T0 + deltT, deltT))
+        solidFrac = [f for f in (np.interp(t, Temperature, solidFrac) for t in Trange) if f <= fs_co]
+        Trange = Trange[:len(solidFrac)]
+        CD1.append(getIntegral(Trange, [f**2 / (1 - f)**2 for f in solidFrac]))
+        CD2.append(getIntegral(Trange, solidFrac))
+    return CD1, CD2
+
+
+def referenceNeighbor(temperature, solidFraction, points):
+    """Temperatures at ``points`` from sklearn's distance-weighted 2-nearest-neighbor regression of each curve."""
+    neighbors = pytest.importorskip("sklearn.neighbors")
+    result = []
+    for Temperature, solidFrac in zip(temperature, solidFraction):
+        if Temperature is None or len(Temperature) < 10 or max(solidFrac) <= max(points):
+            result.append(None)
+            continue
+        model = neighbors.KNeighborsRegressor(2, weights='distance').fit(np.reshape(solidFrac, (-1, 1)), Temperature)
+        result.append(model.predict(np.reshape(points, (-1, 1))))
+    return result
+
+
+def assertSame(actual, expected, rtol=1e-12):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if e is None:
+            assert a is None or np.isnan(a)
+        else:
+            assert a == pytest.approx(e, rel=rtol, abs=rtol)
+
+
+def test_csc_and_kou_arrays_match_loops(curves):
+    packed = packCurves(*curves)
+    assertSame(getCSCArray(*packed), getCSC(*curves, CSCPoints=[0.4, 0.9, 0.99]))
+    assertSame(getKouArray(*packed), getKou(*curves, KouPoints=[0.93, 0.98]))
+
+
+def test_cd_matches_point_by_point(curves):
+    sRDG, iCSC = getCD(*curves)
+    expected = referenceCD(*curves)
+    assertSame(sRDG, expected[0], rtol=1e-9)
+    assertSame(iCSC, expected[1], rtol=1e-9)
+
+
+def test_neighbor_criteria_match_sklearn(curves):
+    T3, T2, T1 = zip(*[(None,) * 3 if t is None else t for t in referenceNeighbor(*curves, [0.4, 0.9, 0.99])])
+    assertSame(getNeighborCSC(*curves), [None if a is None else (a - b) / (b - c) for a, b, c in zip(T1, T2, T3)],
+               rtol=1e-9)
+    Kou = [None if t is None else abs((t[1] - t[0]) / (0.98**0.5 - 0.93**0.5))
+           for t in referenceNeighbor(*curves, [0.93, 0.98])]
+    assertSame(getNeighborKou(*curves), Kou, rtol=1e-9)
@@ -0,0 +1,64 @@
+import os
+import time
+import importlib.util
+
+import pytest
+
+pytest.importorskip("pycalphad")
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(REPO, "ammap", "templates", "equilibrium_callable_template.py")
+TDB = os.path.join(REPO, "ammap", "databases", "Cr-Fe-Ni_miettinen1999.tdb")
+# Compositions of a Cr-Fe-Ni grid with 10 divisions, inside the simplex
+GRID = [[i / 10, j / 10, 1 - (i + j) / 10] for i in range(1, 10) for j in range(1, 10 - i)]
+
+
+@pytest.fixture(scope="module")
+def eq_module(tmp_path_factory):
+    """The equilibrium callable module generated for Cr-Fe-Ni, as construct_callables writes it."""
+    with open(TEMPLATE) as f:
+        template = f.read()
+    path = tmp_path_factory.mktemp("callables") / "equilibrium_CrFeNi.py"
+    path.write_text(template.format(
+        tdb_file=TDB, temperature_list=[2000, 1900, 1800, 1700, 1600, 1500, 1400, 1300, 1200, 1100, 1000, 900, 800],
+        elements=['Cr', 'Fe', 'Ni'], feasible_phases=['FCC_A1'], pressure=101325))
+    spec = importlib.util.spec_from_file_location("equilibrium_CrFeNi", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def phase_sets(records):
+    return [(record['Temperature'], sorted(record['Phases'])) for record in records]
+
+
+@pytest.fixture(scope="module")
+def cold(eq_module):
+    return [eq_module.equilibrium_callable(elP, seed=[]) for elP in GRID]
+
+
+@pytest.mark.parametrize("offset", [1, len(GRID) // 2], ids=["neighbor", "distant"])
+def test_seeded_matches_cold(eq_module, cold, offset):
+    for k, elP in enumerate(GRID):
+        seeded = eq_module.equilibrium_callable(elP, seed=cold[k - offset])
+        assert phase_sets(seeded) == phase_sets(cold[k]), elP
+
+
+def test_seeded_is_faster(eq_module, cold):
+    start = time.perf_counter()
+    for elP in GRID:
+        eq_module.equilibrium_callable(elP, seed=[])
+    coldTime = time.perf_counter() - start
+    start = time.perf_counter()
+    for k, elP in enumerate(GRID):
+        eq_module.equilibrium_callable(elP, seed=cold[k - 1])
+    assert time.perf_counter() - start < 0.8 * coldTime
+
+
+@pytest.mark.parametrize("elP", [GRID[0], GRID[len(GRID) // 2], GRID[-1]])
+def test_feasible_accepts_seed(eq_module, elP):
+    unseeded = eq_module.equilibrium_feasible(elP)
+    for seed in ([], unseeded, {'Feasible': False, 'FailedTemperature': 900.0, 'Results': []}):
+        result = eq_module.equilibrium_feasible(elP, seed=seed)
+        assert result['Feasible'] == unseeded['Feasible']
+        assert result['FailedTemperature'] is None or not result['Feasible']
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from ammap import pathplanning
+
+
+def all_simple_paths(graph, source, target, feasible, weights):
+    """Every simple path through feasible nodes with its cost, by exhaustive depth-first enumeration."""
+    paths = []
+
+    def extend(path, cost):
+        u = path[-1]
+        if u == target:
+            paths.append((list(path), cost))
+            return
+        for e in range(graph.indptr[u], graph.indptr[u + 1]):
+            v = int(graph.indices[e])
+            if feasible[v] and v not in path:
+                path.append(v)
+                extend(path, cost + weights[e])
+                path.pop()
+
+    extend([source], 0.0)
+    return sorted(paths, key=lambda item: item[1])
+
+
+@pytest.fixture
+def small_problem(simplex_graph):
+    graph = simplex_graph(3, 4)
+    rng = np.random.default_rng(1)
+    feasible = rng.random(graph.nNodes) > 0.35
+    feasible[[0, graph.nNodes - 1]] = True
+    # Continuous random weights, so no two paths have the same cost
+    weights = rng.random(graph.nEdges) + 0.5
+    return graph, 0, graph.nNodes - 1, feasible, weights
+
+
+def test_k_shortest_paths_match_enumeration(small_problem):
+    graph, source, target, feasible, weights = small_problem
+    reference = all_simple_paths(graph, source, target, feasible, weights)
+    ksp = pathplanning.KShortestPaths(graph, source, target, feasible, weights)
+    # Computed in two steps, to cover the incremental continuation
+    ksp.get(3)
+    paths = ksp.get(len(reference) + 1)
+    assert [path for path, _ in paths] == [path for path, _ in reference]
+    assert np.allclose([cost for _, cost in paths], [cost for _, cost in reference])
+
+
+@pytest.mark.parametrize("min_difference", [1, 2, 3, 7])
+def test_k_shortest_paths_min_difference(small_problem, min_difference):
+    graph, source, target, feasible, weights = small_problem
+    reference = all_simple_paths(graph, source, target, feasible, weights)
+    expected, covered = [], set()
+    for path, _ in reference:
+        if not expected or len(set(path) - covered) >= min_difference:
+            expected.append(path)
+            covered.update(path)
+    ksp = pathplanning.KShortestPaths(graph, source, target, feasible, weights, min_difference=min_difference,
+                                      max_rejections=len(reference))
+    paths = [path for path, _ in ksp]
+    # The shortest path (6 nodes here) is returned even when it is shorter than min_difference
+    assert paths[0] == reference[0][0]
+    assert paths == expected
+
+
+def test_k_shortest_paths_max_rejections(small_problem):
+    graph, source, target, feasible, weights = small_problem
+    ksp = pathplanning.KShortestPaths(graph, source, target, feasible, weights, min_difference=100, max_rejections=5)
+    assert len(ksp.get(3)) == 1
+    assert len(ksp._shortest) == 6
+    assert ksp.next() is None
@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pycalphad")
+from pycalphad import Database, equilibrium, variables as v
+from pycalphad.core.utils import instantiate_models, filter_phases, unpack_components
+from pycalphad.codegen.callables import build_phase_records
+
+from ammap.callables.solidification import (find_liquidus, solve_local_equilibria, integrate_phase_fractions,
+                                            merge_local_compositions, estimate_merge_error, _liquidMask)
+
+TDB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ammap", "databases",
+                   "Cr-Fe-Ni_miettinen1999.tdb")
+
+
+@pytest.fixture(scope="module")
+def thermo():
+    dbf = Database(TDB)
+    comps = ['CR', 'FE', 'NI', 'VA']
+    phases = filter_phases(dbf, unpack_components(dbf, comps), list(dbf.phases))
+    models = instantiate_models(dbf, comps, phases)
+    records = build_phase_records(dbf, comps, phases, {v.N, v.P, v.T}, models=models)
+    return dict(dbf=dbf, comps=comps, phases_filtered=phases, models=models, phase_records=records)
+
+
+@pytest.mark.parametrize("composition", [(0.2, 0.2), (0.1, 0.7), (0.6, 0.1)])
+@pytest.mark.parametrize("hint", [None, 0, 30, -80, 600])
+def test_find_liquidus_brackets_liquidus(thermo, composition, hint):
+    composition = {v.X('CR'): composition[0], v.X('FE'): composition[1]}
+    reference = find_liquidus(thermo, composition, 2500, 2)
+    liquidus = find_liquidus(thermo, composition, 2500, 2, None if hint is None else reference + hint)
+    # Equilibria flicker within a few K of the liquidus, so differently placed brackets can settle on either side of
+    # such a band; every answer still has to be liquid, close to it, and above solid temperatures
+    assert abs(liquidus - reference) <= 5
+    assert list(_liquidMask(thermo, composition, [liquidus, liquidus - 10], 'LIQUID')) == [True, False]
+
+
+def test_find_liquidus_upper_not_liquid(thermo):
+    assert find_liquidus(thermo, {v.X('CR'): 0.2, v.X('FE'): 0.2}, 1200, 2) is None
+    assert find_liquidus(thermo, {v.X('CR'): 0.2, v.X('FE'): 0.2}, 1200, 2, hint=1000) is None
+
+
+@pytest.fixture(scope="module")
+def local_compositions():
+    """Local compositions where some share their Cr mole fraction, so they are solved in a single group."""
+    X = [(0.2, 0.3), (0.2, 0.5), (0.2, 0.7), (0.1, 0.1), (0.35, 0.4), (0.1, 0.45)]
+    return [{'solid_fraction': 0.1 * (k + 1), 'total_solid': 0.01, 'composition': {v.X('CR'): cr, v.X('FE'): fe}}
+            for k, (cr, fe) in enumerate(X)]
+
+
+def test_solve_local_equilibria_matches_single_points(thermo, local_compositions):
+    temperatures = np.array([700.0, 1000.0, 1300.0])
+    cells, failed = solve_local_equilibria(thermo, local_compositions, temperatures)
+    assert failed == []
+    for c, local in enumerate(local_compositions):
+        for t, temperature in enumerate(temperatures):
+            conds = {v.T: temperature, v.P: 101325, v.N: 1.0, **local['composition']}
+            eq = equilibrium(thermo['dbf'], thermo['comps'], thermo['phases_filtered'], conds,
+                             model=thermo['models'], phase_records=thermo['phase_records'])
+            expected = {}
+            for phase, amount in zip(eq.Phase.values.ravel(), eq.NP.values.ravel()):
+                if phase and str(phase) not in expected:
+                    expected[str(phase)] = float(amount)
+            assert cells[c][t].keys() == expected.keys()
+            for phase, amount in expected.items():
+                assert cells[c][t][phase] == pytest.approx(amount, abs=1e-6)
+
+
+def test_integrate_phase_fractions():
+    cells = [[{'FCC_A1': 1.0}, {'FCC_A1': 0.6, 'BCC_A2': 0.4}],
+             [{'FCC_A1': 0.5, 'BCC_A2': 0.5}, None]]
+    names, integrated, present, successful = integrate_phase_fractions(cells, [1.0, 3.0])
+    assert names == ['BCC_A2', 'FCC_A1']
+    # BCC_A2 only counts the cell it is present in; the fractions are then normalized
+    bcc, fcc = 0.5, (1.0 + 3 * 0.5) / 4
+    assert integrated[0] == pytest.approx([bcc / (bcc + fcc), fcc / (bcc + fcc)])
+    assert integrated[1] == pytest.approx([0.4, 0.6])
+    assert present.tolist() == [[True, True], [True, True]]
+    assert successful.tolist() == [2, 1]
+
+
+def test_merge_local_compositions(local_compositions):
+    unchanged, radii = merge_local_compositions(local_compositions, 0)
+    assert unchanged is local_compositions and not radii.any()
+
+    merged, radii = merge_local_compositions(local_compositions, 0.2)
+    # Runs along the path: the first two (Fe within 0.2 of the first), then one run per remaining composition
+    assert [local.get('merged_count', 1) for local in merged] == [2, 1, 1, 1, 1]
+    assert merged[0]['solid_fraction'] == pytest.approx(0.3)
+    assert merged[0]['composition'][v.X('FE')] == pytest.approx((0.1 * 0.3 + 0.2 * 0.5) / 0.3)
+    assert radii[0] == pytest.approx(merged[0]['composition'][v.X('FE')] - 0.3)
+    assert sum(local['solid_fraction'] for local in merged) == pytest.approx(
+        sum(local['solid_fraction'] for local in local_compositions))
+
+
+def test_estimate_merge_error():
+    locals_ = [{'composition': {v.X('CR'): x}} for x in (0.1, 0.2, 0.4)]
+    cells = [[{'FCC_A1': 1.0}], [{'FCC_A1': 0.5, 'BCC_A2': 0.5}], [{'BCC_A2': 1.0}]]
+    assert not estimate_merge_error(locals_, np.zeros(3), cells, [1, 1, 1]).any()
+    # Moving the middle composition by 0.05 towards either neighbor moves its amounts a half or a quarter of the way
+    error = estimate_merge_error(locals_, np.array([0, 0.05, 0]), cells, [1, 1, 1])
+    _, reference, _, _ = integrate_phase_fractions(cells, [1, 1, 1])
+    changes = []
+    for middle in ({'FCC_A1': 0.75, 'BCC_A2': 0.25}, {'FCC_A1': 0.375, 'BCC_A2': 0.625}):
+        _, perturbed, _, _ = integrate_phase_fractions([cells[0], [middle], cells[2]], [1, 1, 1])
+        changes.append(np.abs(perturbed - reference).max())
+    assert error[0] == pytest.approx(max(changes))
@@ -0,0 +1,73 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from ammap.store import ResultStore, file_hash
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "results.sqlite"))
+
+
+@pytest.fixture
+def tdb(tmp_path):
+    path = tmp_path / "system.tdb"
+    path.write_text("ELEMENT FE BCC_A2 55.847 4489.0 27.28 !\n")
+    return str(path)
+
+
+def test_round_trip(store):
+    result = [{'Temperature': 1000.0, 'Phases': ['FCC_A1'], 'PhaseFraction': np.array([1.0]), 'n': np.int64(2)}]
+    store.put('hash', ['Fe', 'Cr'], {'type': 'equilibrium'}, [0.3, 0.7], result)
+    assert store.get('hash', ['Fe', 'Cr'], {'type': 'equilibrium'}, [0.3, 0.7]) == [
+        {'Temperature': 1000.0, 'Phases': ['FCC_A1'], 'PhaseFraction': [1.0], 'n': 2}]
+    assert len(store) == 1
+
+
+def test_key_normalization(store):
+    store.put('hash', ['Fe', 'Cr'], {'a': 1, 'b': 2}, [0.3, 0.7], 'first')
+    # Element order (with the composition permuted along), parameter order and rounding do not change the key
+    assert store.get('hash', ['Cr', 'Fe'], {'b': 2, 'a': 1}, [0.7, 0.3 + 1e-9]) == 'first'
+    store.put('hash', ['Cr', 'Fe'], {'a': 1, 'b': 2}, [0.7, 0.3], 'second')
+    assert store.get('hash', ['Fe', 'Cr'], {'a': 1, 'b': 2}, [0.3, 0.7]) == 'first'
+    assert len(store) == 1
+    for other in (('other', ['Fe', 'Cr'], {'a': 1, 'b': 2}, [0.3, 0.7]),
+                  ('hash', ['Fe', 'Cr'], {'a': 1, 'b': 3}, [0.3, 0.7]),
+                  ('hash', ['Fe', 'Cr'], {'a': 1, 'b': 2}, [0.31, 0.69])):
+        assert store.get(*other, default='missing') == 'missing'
+
+
+def test_pickled_store_reopens(store):
+    store.put('hash', ['Fe'], {}, [1.0], 'value')
+    assert pickle.loads(pickle.dumps(store)).get('hash', ['Fe'], {}, [1.0]) == 'value'
+
+
+class SolidificationResult:
+    def __init__(self):
+        self.temperatures = np.array([1600.0, 1590.0])
+
+    def to_dict(self):
+        return {'temperatures': self.temperatures}
+
+
+def test_stored_callable(store, tdb):
+    calls = []
+
+    def hybrid_callable(elP, seed=None):
+        calls.append(elP)
+        if elP[0] > 0.5:
+            return None
+        return {'scheil_result': SolidificationResult(), 'liqT': np.float64(1600.0), 'other': {1, 2}}
+
+    wrapped = store.wrap(hybrid_callable, tdb, ['Fe', 'Cr'], {'type': 'hybrid-scheil'})
+    expected = {'scheil_result': {'temperatures': [1600.0, 1590.0]}, 'liqT': 1600.0, 'other': str({1, 2})}
+    # Computed results are returned as computed, stored ones as JSON types
+    assert isinstance(wrapped([0.2, 0.8], seed=[])['scheil_result'], SolidificationResult)
+    assert wrapped([0.2, 0.8]) == expected
+    # Failed evaluations are not stored, so they are computed again
+    assert wrapped([0.8, 0.2]) is None
+    assert wrapped([0.8, 0.2]) is None
+    assert calls == [[0.2, 0.8], [0.8, 0.2], [0.8, 0.2]]
+    assert wrapped.tdb_hash == file_hash(tdb)